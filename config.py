@@ -31,24 +31,52 @@ class Layout:
     GAP_SIZE = 12
     MARGIN_X = 0
     MARGIN_Y = 0
+    BOARD_SIZE = 9 # cells per side of the board being shown
     
     @classmethod
-    def update(cls, width, height):
+    def update(cls, width, height, board_size=None):
         cls.SCREEN_WIDTH = width
         cls.SCREEN_HEIGHT = height
+        if board_size: cls.BOARD_SIZE = board_size
+        n = cls.BOARD_SIZE
         min_dim = min(width, height - 100)
         board_pixel_size = min_dim * 0.85
-        unit = board_pixel_size / 10.6
+        unit = board_pixel_size / (n + (n - 1) * 0.2)
         cls.CELL_SIZE = int(unit)
         cls.GAP_SIZE = int(unit * 0.2)
-        total_board_w = (9 * cls.CELL_SIZE) + (8 * cls.GAP_SIZE)
+        total_board_w = (n * cls.CELL_SIZE) + ((n - 1) * cls.GAP_SIZE)
         cls.MARGIN_X = (width - total_board_w) // 2
         cls.MARGIN_Y = (height - total_board_w) // 2 + 20
 
 # Game & AI Configuration
 class GameConfig:
-    MAX_HISTORY = 200
+    BOARD_SIZE = 9 # odd sizes such as 11 and 13 give the larger variants
+    WALLS_PER_PLAYER = 10
+    MAX_HISTORY = 200 # undo steps kept; the move journal holds twice as many plies
     AI_DEPTH_EASY = 1
-    AI_DEPTH_HARD = 3
+    AI_DEPTH_HARD = 12 # iterative deepening cap; the budgets below usually stop it first
+    AI_TIME_BUDGET = 2.0 # seconds per move, None to search to the depth cap
+    AI_NODE_BUDGET = None
     WIN_SCORE = 10000
-    WALL_SEARCH_RADIUS = 1
+    TT_SIZE_MB = 32 # transposition table memory budget per AI
+    AI_WORKERS = 1 # >1 splits the root moves over a process pool
+    AI_SEED = None # fixed seed for the AI's random choices, None for a fresh one per AI
+    MOVE_ORDERING = 'heuristic' # TT move, killers, forward pawn moves and history; 'legacy' is pawns first
+    WALL_MOVEGEN = 'smart' # 'smart' ranked path cuts, 'radius' walls near the opponent's path, 'all' every legal wall
+    WALL_TOP_K = 10 # walls kept per node by the smart generator, 0 for no limit
+    WALL_SEARCH_RADIUS = 1 # 'radius' mode only
+    WALL_CHECK_PATH_CUT = True # skip the connectivity check for walls off both shortest paths
+    MCTS_ITERATIONS = 20000 # playouts per move for the MCTS engine, on top of the time budget
+    MCTS_ITERATIONS_EASY = 300
+    MCTS_EXPLORATION = 1.4 # UCT exploration constant
+    MCTS_PLAYOUT_DEPTH = 40 # plies before a playout is scored by the remaining race
+    MCTS_WALL_RATE = 0.1 # chance a playout move tries a random wall
+    ENDGAME_CACHE_SIZE = 64 # solved pawn races kept, one per wall layout
+    PATH_CACHE_SIZE = 4096 # wall layouts whose distance maps a game keeps, 0 to disable
+    BOOK_PATH = "quoridor_book.qbk" # opening book built by tools.build_book; ignored if missing
+    GUI_IDLE_WAIT_MS = 1000 # longest the GUI sleeps waiting for input
+    GUI_AI_POLL_MS = 100 # wake-up interval while the AI thinks, for the depth display
+    STATS_LOG_PATH = None # file the AI appends one JSON line of search stats to per move
+    SAVE_PATH = "quoridor_save.qrd" # written by Save, read by Load Game
+    AUTOSAVE_PATH = "quoridor_autosave.qrd" # journal of the game in progress; a new game starts it over
+    AUTOSAVE_SYNC_EVERY = 8 # journal lines written between fsyncs
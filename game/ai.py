@@ -1,40 +1,89 @@
-import pygame
 import random
+import time
 from config import GameConfig
+from game.transposition import TranspositionTable, EXACT, LOWER, UPPER
+from game.book import open_book
+from game import endgame
+from game.distance import UNREACHABLE
+from game.stats import SearchStats
+
+class SearchTimeout(Exception):
+    pass
 
 class AI:
-    def __init__(self, difficulty):
+    TT_MEGABYTES = None # transposition table size, None for GameConfig.TT_SIZE_MB
+
+    def __init__(self, difficulty, time_budget=None, node_budget=None, workers=None, use_book=True, seed=None):
         self.difficulty = difficulty # 1=Easy, 3=Hard
         if difficulty == 1:
             self.max_depth = GameConfig.AI_DEPTH_EASY
         else:
             self.max_depth = GameConfig.AI_DEPTH_HARD
+        self.time_budget = time_budget if time_budget is not None else GameConfig.AI_TIME_BUDGET
+        self.node_budget = node_budget if node_budget is not None else GameConfig.AI_NODE_BUDGET
         
-        self.transposition = {}
+        megabytes = self.TT_MEGABYTES
+        self.transposition = TranspositionTable(GameConfig.TT_SIZE_MB if megabytes is None else megabytes)
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = [] # seconds from the start of get_move to each completed depth
+        self.best_move = None
+        self.stop_requested = False # set from another thread to abort the search
+        self.stop_flag = None # shared multiprocessing value, for pool workers
+        self._deadline = None
+        self._line = [] # undo records of the line being searched
+        self._move_buffers = [[] for _ in range(self.max_depth + 1)] # reused move list per ply
+        self.seed = seed if seed is not None else GameConfig.AI_SEED
+        self.rng = random.Random(self.seed)
+        self.move_ordering = GameConfig.MOVE_ORDERING
+        self.killers = [] # two quiet cutoff moves per ply
+        self.history = {1: [], 2: []} # cutoff score per move code, for each player
+        self.book = open_book(GameConfig.BOOK_PATH) if use_book else None
+        self.book_hits = 0
+        self.endgame_hits = 0
+        self.stats = SearchStats()
+        self.stats_log = GameConfig.STATS_LOG_PATH # JSON line per move appended here when set
+        self.wall_movegen = GameConfig.WALL_MOVEGEN
+        self.wall_top_k = GameConfig.WALL_TOP_K
+
+        self.workers = workers if workers is not None else GameConfig.AI_WORKERS
+        self._parallel = None
+        if self.workers > 1:
+            from game.parallel import ParallelSearch
+            self._parallel = ParallelSearch(self, self.workers)
 
     def evaluate(self, game):
         if game.winner == 2: return GameConfig.WIN_SCORE
         if game.winner == 1: return -GameConfig.WIN_SCORE
         
-        p2_dist = game.shortest_path_len(game.p2_pos, 8)
-        p1_dist = game.shortest_path_len(game.p1_pos, 0)
+        p2_dist = game.shortest_path_len(game.p2_pos, game.p2_goal)
+        p1_dist = game.shortest_path_len(game.p1_pos, game.p1_goal)
         
         score = (20 - p2_dist) * 10 - (20 - p1_dist) * 10
         score += (game.p2_walls - game.p1_walls) * 5
         return score
 
-    def get_all_moves(self, game, player_id):
-        moves = []
+    def get_all_moves(self, game, player_id, moves=None):
+        """Packed move codes for ``player_id``, written into ``moves`` if given."""
+        if moves is None: moves = []
+        else: moves.clear()
+        geo = game.geo
         # Pawn Moves
         for dest in game.get_valid_pawn_moves(player_id):
-            moves.append({'type': 'MOVE', 'dest': dest})
+            moves.append(geo.cell(dest))
 
         # Wall Moves
         has_walls = (player_id == 2 and game.p2_walls > 0) or (player_id == 1 and game.p1_walls > 0)
-        if has_walls:
+        if has_walls and self.wall_movegen == 'smart':
+            moves.extend(self.wall_candidates(game, player_id))
+            return moves
+        if has_walls and self.wall_movegen == 'all':
+            moves.extend(game.legal_walls())
+        elif has_walls:
             target_pos = game.p1_pos if player_id == 2 else game.p2_pos
-            goal_row = 0 if player_id == 2 else 8
+            goal_row = game.p1_goal if player_id == 2 else game.p2_goal
             path = game.shortest_path(target_pos, goal_row)
+            legal = game.legal_walls()
             candidates = set()
             radius = GameConfig.WALL_SEARCH_RADIUS
             
@@ -43,67 +92,286 @@ class AI:
                 for dx in range(-radius, radius + 1):
                     for dy in range(-radius, radius + 1):
                         wx, wy = cx + dx, cy + dy
-                        if 0 <= wx < 8 and 0 <= wy < 8:
+                        if 0 <= wx < geo.slots and 0 <= wy < geo.slots:
                             for orient in ('H', 'V'):
-                                if game.is_valid_wall(wx, wy, orient):
-                                    candidates.add((wx, wy, orient))
-            for (wx, wy, orient) in candidates:
-                moves.append({'type': 'WALL', 'pos': (wx, wy), 'orient': orient})
+                                code = geo.wall_code(wx, wy, orient)
+                                if code in legal: candidates.add(code)
+            moves.extend(candidates)
 
-        random.shuffle(moves)
         return moves
 
-    def minimax(self, game, depth, alpha, beta, maximizing_player):
-        if depth == self.max_depth:
-            pygame.event.pump()
+    def wall_candidates(self, game, player_id):
+        """Walls for ``player_id`` that gain in the path race, best first.
+
+        Attacking walls cut the opponent's shortest path and score how much
+        longer it gets than ours. Defending walls take a slot the opponent
+        could cut our path from and score that cut plus their own effect.
+        Only walls that score above zero are kept, at most ``wall_top_k``.
+        """
+        geo = game.geo
+        edge_walls = geo.edge_walls
+        opponent = 2 if player_id == 1 else 1
+        me, opp = player_id - 1, opponent - 1 # indexes into (p1, p2) lengths
+        base = game.path_lengths()
+        gains = {} # wall code -> (opponent's extra steps - ours), None if illegal
+
+        def gain(code):
+            if code not in gains:
+                lengths = game.path_lengths_with_wall(code)
+                if lengths is None or lengths[0] >= UNREACHABLE or lengths[1] >= UNREACHABLE: gains[code] = None
+                else: gains[code] = (lengths[opp] - base[opp]) - (lengths[me] - base[me])
+            return gains[code]
+
+        def cuts(mask):
+            codes = set()
+            while mask:
+                bit = mask & -mask
+                codes.update(edge_walls[bit])
+                mask ^= bit
+            return codes
+
+        scores = {}
+        for code in cuts(game.path_edge_mask(opponent)):
+            g = gain(code)
+            if g is not None and g > 0: scores[code] = g
 
-        state_key = game.get_hashable_state()
-        tt_entry = self.transposition.get((state_key, depth, maximizing_player))
+        if game.p1_walls if opponent == 1 else game.p2_walls:
+            for threat in cuts(game.path_edge_mask(player_id)):
+                g = gain(threat)
+                if g is None or g >= 0: continue
+                for code in geo.conflict_codes[threat - geo.num_cells]:
+                    own = gain(code)
+                    if own is None: continue
+                    score = own - g
+                    if score > scores.get(code, 0): scores[code] = score
+
+        ranked = sorted(scores, key=lambda code: (-scores[code], code))
+        return ranked[:self.wall_top_k] if self.wall_top_k else ranked
+
+    def check_budget(self):
+        if self.stop_requested or (self.stop_flag is not None and self.stop_flag.value): raise SearchTimeout()
+        if not self.completed_depth: return
+        if self.node_budget and self.nodes >= self.node_budget: raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() >= self._deadline: raise SearchTimeout()
+
+    def search_settings(self):
+        """Options a pool worker copies so it runs the same search as this engine."""
+        return {'wall_movegen': self.wall_movegen, 'wall_top_k': self.wall_top_k,
+                'move_ordering': self.move_ordering, 'seed': self.seed}
+
+    def new_search(self, game):
+        """Forget the killers and halve the history scores before searching ``game``."""
+        size = game.geo.num_moves
+        for player, table in self.history.items():
+            if len(table) != size: self.history[player] = [0] * size
+            else: table[:] = [v >> 1 for v in table]
+        self.killers = [[None, None] for _ in range(len(self._move_buffers))]
+
+    def order_moves(self, game, moves, player_id, tt_move, ply):
+        """Sort ``moves`` in place, most promising first.
+
+        The TT move leads, then this ply's killers, pawn moves that get closer
+        to the goal, walls, and other pawn moves. Within each group moves go
+        by history score, and the sort being stable leaves moves with equal
+        scores, such as walls without cutoffs yet, in generator order.
+        """
+        num_cells = game.geo.num_cells
+        if self.move_ordering == 'legacy':
+            self.rng.shuffle(moves)
+            moves.sort(key=lambda m: m >= num_cells)
+        else:
+            dist = game.goal_distances(player_id)
+            here = dist[game.geo.cell(game.p1_pos if player_id == 1 else game.p2_pos)]
+            history = self.history[player_id]
+            killer1, killer2 = self.killers[ply] if ply < len(self.killers) else (None, None)
+            def rank(m):
+                if m == killer1: return (-2, 0)
+                if m == killer2: return (-1, 0)
+                if m >= num_cells: return (1, -history[m])
+                return (0 if dist[m] < here else 2, -history[m])
+            moves.sort(key=rank)
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+    def record_cutoff(self, move, player_id, depth, ply):
+        """Credit ``move`` for a beta cutoff in the history table and this ply's killers."""
+        self.history[player_id][move] += depth * depth
+        while len(self.killers) <= ply: self.killers.append([None, None])
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def _buffer(self, ply):
+        buffers = self._move_buffers
+        while len(buffers) <= ply: buffers.append([])
+        return buffers[ply]
+
+    def minimax(self, game, depth, alpha, beta, maximizing_player, ply=0):
+        self.nodes += 1
+        if self.nodes & 63 == 0:
+            self.check_budget()
+
+        state_key = game.zkey
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        tt_entry = self.transposition.probe(state_key)
         if tt_entry is not None:
-            return tt_entry[0], tt_entry[1]
+            tt_depth, tt_val, tt_flag, tt_move = tt_entry
+            if tt_depth >= depth:
+                if tt_flag == EXACT: return tt_val, tt_move
+                if tt_flag == LOWER: alpha = max(alpha, tt_val)
+                else: beta = min(beta, tt_val)
+                if beta <= alpha: return tt_val, tt_move
 
+        if not (game.p1_walls and game.p2_walls):
+            solved = endgame.probe(game, solve=False)
+            if solved is not None:
+                winner, plies, _ = solved
+                if not winner: return 0, None
+                return (GameConfig.WIN_SCORE - plies if winner == 2 else plies - GameConfig.WIN_SCORE), None
+
+        stats = self.stats
         if depth == 0 or game.winner:
+            start = time.perf_counter()
             val = self.evaluate(game)
-            self.transposition[(state_key, depth, maximizing_player)] = (val, None)
+            stats.evaluate_seconds += time.perf_counter() - start
+            self.transposition.store(state_key, depth, val, EXACT, None)
             return val, None
 
         best_move = None
         
         player_id = 2 if maximizing_player else 1
-        moves = self.get_all_moves(game, player_id)
-        moves.sort(key=lambda m: 0 if m['type'] == 'MOVE' else 1)
+        start = time.perf_counter()
+        moves = self.get_all_moves(game, player_id, self._buffer(ply))
+        stats.movegen_seconds += time.perf_counter() - start
+        stats.expanded += 1
+        stats.generated += len(moves)
+        self.order_moves(game, moves, player_id, tt_move, ply)
 
         if maximizing_player:
             max_eval = -float('inf')
             for move in moves:
                 undo_data = game.apply_move_fast(move)
-                eval_val, _ = self.minimax(game, depth - 1, alpha, beta, False)
+                self._line.append(undo_data)
+                eval_val, _ = self.minimax(game, depth - 1, alpha, beta, False, ply + 1)
+                self._line.pop()
                 game.undo_move_fast(undo_data)
 
                 if eval_val > max_eval:
                     max_eval = eval_val
                     best_move = move
                 alpha = max(alpha, eval_val)
-                if beta <= alpha: break
+                if beta <= alpha:
+                    stats.cutoff(ply)
+                    self.record_cutoff(move, player_id, depth, ply)
+                    break
             
-            self.transposition[(state_key, depth, maximizing_player)] = (max_eval, best_move)
+            self.store(state_key, depth, max_eval, alpha_orig, beta_orig, best_move)
             return max_eval, best_move
         else:
             min_eval = float('inf')
             for move in moves:
                 undo_data = game.apply_move_fast(move)
-                eval_val, _ = self.minimax(game, depth - 1, alpha, beta, True)
+                self._line.append(undo_data)
+                eval_val, _ = self.minimax(game, depth - 1, alpha, beta, True, ply + 1)
+                self._line.pop()
                 game.undo_move_fast(undo_data)
 
                 if eval_val < min_eval:
                     min_eval = eval_val
                     best_move = move
                 beta = min(beta, eval_val)
-                if beta <= alpha: break
+                if beta <= alpha:
+                    stats.cutoff(ply)
+                    self.record_cutoff(move, player_id, depth, ply)
+                    break
 
-            self.transposition[(state_key, depth, maximizing_player)] = (min_eval, best_move)
+            self.store(state_key, depth, min_eval, alpha_orig, beta_orig, best_move)
             return min_eval, best_move
 
+    def store(self, state_key, depth, value, alpha, beta, best_move):
+        if value <= alpha: flag = UPPER
+        elif value >= beta: flag = LOWER
+        else: flag = EXACT
+        self.transposition.store(state_key, depth, value, flag, best_move)
+
     def get_move(self, game):
-        _, move = self.minimax(game, self.max_depth, -float('inf'), float('inf'), True)
+        """Book move, then solved endgame move, then a search; ``stats`` describes the call."""
+        stats = self.stats
+        stats.begin(game, self.transposition)
+        with stats.phase('book'):
+            move, source = self.book_move(game), 'book'
+        if move is None:
+            with stats.phase('endgame'):
+                move, source = self.endgame_move(game), 'endgame'
+        if move is None:
+            with stats.phase('search'):
+                move, source = self.search_move(game), 'search'
+        stats.finish(self, game, move, source)
+        if self.stats_log:
+            with open(self.stats_log, 'a') as f: f.write(stats.to_json() + '\n')
         return move
+
+    def search_move(self, game):
+        """Iterative deepening until the depth cap or the time/node budget is hit.
+
+        Each iteration starts from the best moves the previous one left in the
+        transposition table; only fully completed iterations are trusted.
+        """
+        if self._parallel: return self._parallel.get_move(game)
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.best_move = None
+        self.new_search(game)
+        start = time.perf_counter()
+        self._deadline = start + self.time_budget if self.time_budget else None
+        best_move = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self.minimax(game, depth, -float('inf'), float('inf'), game.turn == 2)
+            except SearchTimeout:
+                while self._line: game.undo_move_fast(self._line.pop())
+                break
+            if move is not None: best_move = self.best_move = move
+            self.completed_depth = depth
+            self.depth_times.append(time.perf_counter() - start)
+            if abs(score) >= GameConfig.WIN_SCORE: break
+            try:
+                self.check_budget()
+            except SearchTimeout:
+                break
+        return best_move
+
+    def book_move(self, game):
+        """Stored move for this position, skipping entries deeper than this AI searches."""
+        book = self.book
+        if book is None or book.size != game.geo.size or book.walls != game.walls_per_player: return None
+        entry = book.probe(game.zkey)
+        if entry is None or entry[2] > self.max_depth or not game.is_legal_move(entry[0]): return None
+        self.book_hits += 1
+        self.nodes = 0
+        self.completed_depth = entry[2]
+        self.depth_times = []
+        self.best_move = entry[0]
+        return entry[0]
+
+    def endgame_move(self, game):
+        """Solver move once the position is a decided pawn race."""
+        solved = endgame.probe(game)
+        if solved is None or solved[2] is None: return None
+        self.endgame_hits += 1
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.best_move = solved[2]
+        return solved[2]
+
+    def close(self):
+        if self._parallel: self._parallel.close()
+
+    def progress(self):
+        return {'depth': self.completed_depth, 'nodes': self.nodes, 'best_move': self.best_move,
+                'book_hits': self.book_hits, 'endgame_hits': self.endgame_hits}
@@ -0,0 +1,104 @@
+from functools import lru_cache
+
+H, V = 'H', 'V'
+
+class BoardGeometry:
+    """Precomputed bit layouts and neighbour tables for an N x N board.
+
+    Cells are indexed ``y * size + x`` and wall slots ``y * (size - 1) + x``.
+    Every cell owns two edge bits in the ``blocked`` mask: bit ``2c`` for the
+    edge to the cell below it and bit ``2c + 1`` for the edge to its right.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.slots = size - 1
+        n, s = size, size - 1
+        self.num_cells = n * n
+        self.num_slots = s * s
+
+        self.coords = [(c % n, c // n) for c in range(self.num_cells)]
+        self.slot_coords = [(i % s, i // s) for i in range(self.num_slots)]
+
+        # (neighbour cell, edge mask) in up/down/left/right order
+        self.neighbors = []
+        for c, (x, y) in enumerate(self.coords):
+            row = []
+            if y > 0: row.append((c - n, 1 << (2 * (c - n))))
+            if y < n - 1: row.append((c + n, 1 << (2 * c)))
+            if x > 0: row.append((c - 1, 1 << (2 * (c - 1) + 1)))
+            if x < n - 1: row.append((c + 1, 1 << (2 * c + 1)))
+            self.neighbors.append(tuple(row))
+
+        # Edge bits covered by a wall in each slot, and the cell pairs they separate
+        self.wall_edges = {H: [], V: []}
+        self.wall_pairs = {H: [], V: []}
+        for x, y in self.slot_coords:
+            c = y * n + x
+            self.wall_edges[H].append((1 << (2 * c)) | (1 << (2 * (c + 1))))
+            self.wall_edges[V].append((1 << (2 * c + 1)) | (1 << (2 * (c + n) + 1)))
+            self.wall_pairs[H].append(((c, c + n), (c + 1, c + 1 + n)))
+            self.wall_pairs[V].append(((c, c + 1), (c + n, c + n + 1)))
+
+        # Packed move codes: pawn moves are the destination cell index,
+        # followed by every H wall slot and then every V wall slot.
+        self.num_moves = self.num_cells + 2 * self.num_slots
+        self.move_walls = [(pos, o) for o in (H, V) for pos in self.slot_coords]
+
+        # Slots a new wall may not share with existing (H mask, V mask)
+        self.conflicts = {H: [], V: []}
+        for i, (x, y) in enumerate(self.slot_coords):
+            h = 1 << i
+            if x > 0: h |= 1 << (i - 1)
+            if x < s - 1: h |= 1 << (i + 1)
+            self.conflicts[H].append((h, 1 << i))
+            v = 1 << i
+            if y > 0: v |= 1 << (i - s)
+            if y < s - 1: v |= 1 << (i + s)
+            self.conflicts[V].append((1 << i, v))
+
+        # Wall codes covering each edge bit, and the wall codes a wall rules out
+        self.edge_walls = {}
+        self.conflict_codes = []
+        for i, (pos, o) in enumerate(self.move_walls):
+            slot = self.slot(*pos)
+            edges = self.wall_edges[o][slot]
+            while edges:
+                bit = edges & -edges
+                self.edge_walls.setdefault(bit, []).append(self.num_cells + i)
+                edges ^= bit
+            h, v = self.conflicts[o][slot]
+            self.conflict_codes.append(tuple(
+                [self.num_cells + j for j in range(self.num_slots) if h >> j & 1] +
+                [self.num_cells + self.num_slots + j for j in range(self.num_slots) if v >> j & 1]))
+
+    def cell(self, pos):
+        return pos[1] * self.size + pos[0]
+
+    def slot(self, x, y):
+        return y * self.slots + x
+
+    def wall_code(self, x, y, orientation):
+        return self.num_cells + (self.num_slots if orientation == V else 0) + y * self.slots + x
+
+    def encode(self, move):
+        """Dict move (as used by the GUI) -> packed move code."""
+        if move['type'] == 'MOVE': return self.cell(move['dest'])
+        return self.wall_code(move['pos'][0], move['pos'][1], move['orient'])
+
+    def decode(self, code):
+        """Packed move code -> dict move."""
+        if code < self.num_cells: return {'type': 'MOVE', 'dest': self.coords[code]}
+        pos, orient = self.move_walls[code - self.num_cells]
+        return {'type': 'WALL', 'pos': pos, 'orient': orient}
+
+    def edge_mask(self, c1, c2):
+        """Mask of the single edge between two orthogonally adjacent cells."""
+        (x1, y1), (x2, y2) = c1, c2
+        n = self.size
+        if x1 == x2: return 1 << (2 * (min(y1, y2) * n + x1))
+        return 1 << (2 * (y1 * n + min(x1, x2)) + 1)
+
+@lru_cache(maxsize=None)
+def geometry(size):
+    return BoardGeometry(size)
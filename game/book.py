@@ -0,0 +1,61 @@
+import mmap
+import os
+import struct
+from functools import lru_cache
+
+MAGIC = b'QBK1'
+_HEADER = struct.Struct('<4sBBxxQ') # magic, board size, walls per player, entry count
+_ENTRY = struct.Struct('<QHhBxxx') # zobrist key, move code, score, search depth
+
+class OpeningBook:
+    """Read-only opening book: fixed-size entries sorted by Zobrist key.
+
+    The file is memory-mapped, so opening it reads nothing up front and a
+    lookup touches only the pages its binary search lands on.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.walls, self.count = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or len(self._map) != _HEADER.size + self.count * _ENTRY.size:
+            self._map.close()
+            raise ValueError(f"{path} is not an opening book")
+
+    def __len__(self):
+        return self.count
+
+    def _key_at(self, i):
+        return struct.unpack_from('<Q', self._map, _HEADER.size + i * _ENTRY.size)[0]
+
+    def probe(self, key):
+        """``(move, score, depth)`` stored for ``key``, or None."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key: lo = mid + 1
+            else: hi = mid
+        if lo == self.count or self._key_at(lo) != key: return None
+        return _ENTRY.unpack_from(self._map, _HEADER.size + lo * _ENTRY.size)[1:4]
+
+    def close(self):
+        self._map.close()
+
+def write_book(path, entries, size, walls):
+    """Write ``{key: (move, score, depth)}`` as a sorted book file."""
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, size, walls, len(entries)))
+        for key in sorted(entries):
+            move, score, depth = entries[key]
+            f.write(_ENTRY.pack(key, move, max(-32768, min(32767, score)), depth))
+    os.replace(tmp, path)
+
+@lru_cache(maxsize=None)
+def open_book(path):
+    """Shared book for ``path``, or None when there is no usable book there."""
+    if not path or not os.path.exists(path): return None
+    try:
+        return OpeningBook(path)
+    except (OSError, ValueError, struct.error):
+        return None
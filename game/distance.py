@@ -0,0 +1,149 @@
+import heapq
+
+UNREACHABLE = 999
+
+class DistanceField:
+    """BFS distance from every cell to a goal row, kept in sync with the walls.
+
+    Placing a wall can only lengthen distances and removing one can only
+    shorten them, so both updates touch just the cells whose value changes.
+    ``dist`` is replaced rather than mutated, so callers may keep references
+    to old maps.
+    """
+
+    def __init__(self, geo, goal_row, blocked=0):
+        self.geo = geo
+        self.goal_row = goal_row
+        self.goal_cells = [goal_row * geo.size + x for x in range(geo.size)]
+        self._edges_key = None
+        self._edges = 0
+        self.rebuild(blocked)
+
+    def rebuild(self, blocked):
+        neighbors = self.geo.neighbors
+        dist = [UNREACHABLE] * self.geo.num_cells
+        frontier = self.goal_cells
+        for c in frontier: dist[c] = 0
+        d = 0
+        while frontier:
+            d += 1
+            nxt = []
+            for c in frontier:
+                for nc, edge in neighbors[c]:
+                    if dist[nc] == UNREACHABLE and not blocked & edge:
+                        dist[nc] = d
+                        nxt.append(nc)
+            frontier = nxt
+        self.dist = dist
+
+    def add_wall(self, blocked, pairs):
+        """Update after the edges in ``pairs`` became blocked in ``blocked``."""
+        dist = self.dist
+        neighbors = self.geo.neighbors
+        heap = []
+        for a, b in pairs:
+            if dist[a] == dist[b] + 1: heapq.heappush(heap, (dist[a], a))
+            elif dist[b] == dist[a] + 1: heapq.heappush(heap, (dist[b], b))
+        if not heap: return
+
+        # Cells that lost every neighbour one step closer to the goal, in
+        # increasing distance order so supports are final when checked.
+        lost = set()
+        while heap:
+            d, c = heapq.heappop(heap)
+            if c in lost or d == 0: continue
+            supported = False
+            for nc, edge in neighbors[c]:
+                if not blocked & edge and dist[nc] == d - 1 and nc not in lost:
+                    supported = True
+                    break
+            if supported: continue
+            lost.add(c)
+            for nc, edge in neighbors[c]:
+                if dist[nc] == d + 1 and not blocked & edge:
+                    heapq.heappush(heap, (d + 1, nc))
+        if not lost: return
+
+        dist = list(dist)
+        for c in lost: dist[c] = UNREACHABLE
+        for c in lost:
+            best = UNREACHABLE
+            for nc, edge in neighbors[c]:
+                if not blocked & edge and nc not in lost and dist[nc] + 1 < best:
+                    best = dist[nc] + 1
+            if best < UNREACHABLE:
+                dist[c] = best
+                heap.append((best, c))
+        heapq.heapify(heap)
+        while heap:
+            d, c = heapq.heappop(heap)
+            if d > dist[c]: continue
+            for nc, edge in neighbors[c]:
+                if nc in lost and not blocked & edge and d + 1 < dist[nc]:
+                    dist[nc] = d + 1
+                    heapq.heappush(heap, (d + 1, nc))
+        self.dist = dist
+
+    def remove_wall(self, blocked, pairs):
+        """Update after the edges in ``pairs`` became open in ``blocked``."""
+        dist = self.dist
+        heap = []
+        for a, b in pairs:
+            if dist[a] + 1 < dist[b]: heap.append((dist[a] + 1, b))
+            elif dist[b] + 1 < dist[a]: heap.append((dist[b] + 1, a))
+        if not heap: return
+
+        dist = list(dist)
+        neighbors = self.geo.neighbors
+        heapq.heapify(heap)
+        while heap:
+            d, c = heapq.heappop(heap)
+            if d >= dist[c]: continue
+            dist[c] = d
+            for nc, edge in neighbors[c]:
+                if d + 1 < dist[nc] and not blocked & edge:
+                    heapq.heappush(heap, (d + 1, nc))
+        self.dist = dist
+
+    def copy(self):
+        clone = DistanceField.__new__(DistanceField)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def path(self, start, blocked):
+        """Shortest path from ``start`` (a cell index) down the gradient, as cell indices."""
+        dist = self.dist
+        d = dist[start]
+        if d >= UNREACHABLE: return []
+        neighbors = self.geo.neighbors
+        path = [start]
+        c = start
+        while d:
+            d -= 1
+            for nc, edge in neighbors[c]:
+                if dist[nc] == d and not blocked & edge:
+                    c = nc
+                    break
+            path.append(c)
+        return path
+
+    def path_edges(self, start, blocked):
+        """Edge mask of the shortest path from ``start``; a wall that misses it cannot disconnect ``start``."""
+        key = (start, blocked)
+        if key == self._edges_key: return self._edges
+        dist = self.dist
+        neighbors = self.geo.neighbors
+        mask = 0
+        c = start
+        d = dist[c]
+        if d < UNREACHABLE:
+            while d:
+                d -= 1
+                for nc, edge in neighbors[c]:
+                    if dist[nc] == d and not blocked & edge:
+                        mask |= edge
+                        c = nc
+                        break
+        self._edges_key = key
+        self._edges = mask
+        return mask
@@ -0,0 +1,121 @@
+from collections import OrderedDict, deque
+from config import GameConfig
+
+def pawn_moves(geo, blocked, me, opp):
+    """Pawn destinations from cell ``me`` with the opponent on ``opp``.
+
+    Same rules as QuoridorGame.get_valid_pawn_moves, on cell indices.
+    """
+    moves = []
+    for n, edge in geo.neighbors[me]:
+        if blocked & edge: continue
+        if n != opp:
+            moves.append(n)
+            continue
+        behind = 2 * n - me
+        straight = [nc for nc, e in geo.neighbors[n] if nc == behind and not blocked & e]
+        if straight:
+            moves.extend(straight)
+        else:
+            moves.extend(nc for nc, e in geo.neighbors[n] if nc != me and not blocked & e)
+    return moves
+
+class RaceTable:
+    """Solved pawn race for one wall layout, by retrograde analysis.
+
+    For every (p1 cell, p2 cell, side to move) it holds the winner under
+    perfect play (0 if neither can force a win) and the plies until the game
+    ends, counted backwards from the finished positions.
+    """
+
+    def __init__(self, geo, blocked):
+        self.geo = geo
+        self.blocked = blocked
+        n = geo.num_cells
+        size = geo.size
+        total = 2 * n * n
+        self.winner = bytearray(total)
+        self.plies = [0] * total
+        remaining = [0] * total
+        preds = [[] for _ in range(total)]
+        queue = deque()
+        for p1 in range(n):
+            for p2 in range(n):
+                if p1 == p2: continue
+                for turn in (1, 2):
+                    s = self.index(p1, p2, turn)
+                    if p1 < size or p2 >= n - size:
+                        self.winner[s] = 1 if p1 < size else 2
+                        queue.append(s)
+                        continue
+                    if turn == 1:
+                        succ = [self.index(m, p2, 2) for m in pawn_moves(geo, blocked, p1, p2)]
+                    else:
+                        succ = [self.index(p1, m, 1) for m in pawn_moves(geo, blocked, p2, p1)]
+                    remaining[s] = len(succ)
+                    for t in succ: preds[t].append(s)
+
+        # Breadth-first from the finished positions, so the first winning
+        # successor found is the quickest and a loss is fixed by its slowest.
+        while queue:
+            t = queue.popleft()
+            winner, plies = self.winner[t], self.plies[t] + 1
+            for s in preds[t]:
+                if self.winner[s]: continue
+                mover = 1 if s % 2 == 0 else 2
+                if winner != mover:
+                    remaining[s] -= 1
+                    if remaining[s]: continue
+                self.winner[s] = winner
+                self.plies[s] = plies
+                queue.append(s)
+
+    def index(self, p1, p2, turn):
+        return 2 * (p1 * self.geo.num_cells + p2) + turn - 1
+
+    def best_move(self, p1, p2, turn):
+        """Pawn cell to move to: the fastest win, else the slowest loss, else a drawn line."""
+        geo, blocked = self.geo, self.blocked
+        me, opp = (p1, p2) if turn == 1 else (p2, p1)
+        best, best_rank = None, None
+        for m in pawn_moves(geo, blocked, me, opp):
+            t = self.index(m, p2, 2) if turn == 1 else self.index(p1, m, 1)
+            winner, plies = self.winner[t], self.plies[t]
+            if winner == turn: rank = (2, -plies)
+            elif winner: rank = (0, plies)
+            else: rank = (1, 0)
+            if best_rank is None or rank > best_rank: best, best_rank = m, rank
+        return best
+
+_tables = OrderedDict()
+
+def race_table(geo, blocked, solve=True):
+    """Cached RaceTable for a wall layout; None if uncached and ``solve`` is false."""
+    key = (geo.size, blocked)
+    table = _tables.get(key)
+    if table is not None:
+        _tables.move_to_end(key)
+        return table
+    if not solve: return None
+    table = _tables[key] = RaceTable(geo, blocked)
+    while len(_tables) > GameConfig.ENDGAME_CACHE_SIZE: _tables.popitem(last=False)
+    return table
+
+def probe(game, solve=True):
+    """``(winner, plies, move)`` if the position is decided by the pawn race, else None.
+
+    Exact when neither side has walls left. When only one side does, a race
+    that side wins is still a proven win, since it can simply never wall.
+    """
+    if game.winner: return None
+    walls1, walls2 = game.p1_walls, game.p2_walls
+    if walls1 and walls2: return None
+    table = race_table(game.geo, game.blocked, solve)
+    if table is None: return None
+    geo = game.geo
+    p1, p2 = geo.cell(game.p1_pos), geo.cell(game.p2_pos)
+    s = table.index(p1, p2, game.turn)
+    winner = table.winner[s]
+    if walls1 or walls2:
+        if winner != (1 if walls1 else 2): return None
+    return winner, table.plies[s], table.best_move(p1, p2, game.turn)
@@ -0,0 +1,65 @@
+from array import array
+
+_MOVE_BITS = 11
+_MOVE_MASK = (1 << _MOVE_BITS) - 1
+_STEP_FLAG = 1 << (2 * _MOVE_BITS)
+
+class MoveJournal:
+    """Undo/redo history as a fixed-size ring buffer of packed plies.
+
+    Each ply is one 32-bit int holding the move code, the mover's previous
+    pawn cell (to invert pawn moves) and whether the ply starts a new undo
+    step. Plies after ``cursor`` have been undone and can be redone. When the
+    buffer is full the oldest ply is dropped.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._plies = array('i', bytes(4 * capacity))
+        self._start = 0
+        self._len = 0
+        self.cursor = 0 # plies currently applied
+        self.dropped = 0 # plies that fell off the front of the buffer
+
+    def __len__(self):
+        return self._len
+
+    def _at(self, i):
+        packed = self._plies[(self._start + i) % self.capacity]
+        return packed & _MOVE_MASK, (packed >> _MOVE_BITS) & _MOVE_MASK, bool(packed & _STEP_FLAG)
+
+    def record(self, move, prev_cell, new_step):
+        """Append a ply at the cursor, discarding anything that could be redone."""
+        self._len = self.cursor
+        if self._len == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+            self._len -= 1
+            self.dropped += 1
+        packed = move | (prev_cell << _MOVE_BITS) | (_STEP_FLAG if new_step else 0)
+        self._plies[(self._start + self._len) % self.capacity] = packed
+        self._len += 1
+        self.cursor = self._len
+
+    def clear(self):
+        self._start = self._len = self.cursor = self.dropped = 0
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < self._len
+
+    def step_back(self):
+        self.cursor -= 1
+        return self._at(self.cursor)
+
+    def step_forward(self):
+        self.cursor += 1
+        return self._at(self.cursor - 1)
+
+    def next_starts_step(self):
+        return self._at(self.cursor)[2]
+
+    def moves(self, start=0):
+        """Move codes of the applied plies from buffer index ``start``, oldest first."""
+        return [self._at(i)[0] for i in range(start, self.cursor)]
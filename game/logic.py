@@ -1,35 +1,81 @@
-import pickle
 import heapq
+from collections import OrderedDict
 from config import GameConfig
+from game.board import geometry
+from game.distance import DistanceField, UNREACHABLE
+from game.history import MoveJournal
+from game.stats import GameStats
+from game.zobrist import zobrist_table
+
+def _new_journal():
+    # MAX_HISTORY counts undo steps; a PVE step is the human move plus the AI reply
+    return MoveJournal(2 * GameConfig.MAX_HISTORY)
 
 class QuoridorGame:
-    def __init__(self):
-        self.p1_pos = (4, 8) # (x, y)
-        self.p2_pos = (4, 0)
+    def __init__(self, size=None, walls_per_player=None):
+        if size is None: size = GameConfig.BOARD_SIZE
+        self.p1_pos = (size // 2, size - 1) # (x, y)
+        self.p2_pos = (size // 2, 0)
+        self.p1_goal = 0 # row each player races to
+        self.p2_goal = size - 1
         self.walls = [] 
+        self.geo = geometry(size)
+        self.h_walls = 0 # wall slot bitmasks
+        self.v_walls = 0
+        self.blocked = 0 # blocked cell edge bitmask
         self.turn = 1 
-        self.p1_walls = 10
-        self.p2_walls = 10
+        self.walls_per_player = walls_per_player if walls_per_player is not None else GameConfig.WALLS_PER_PLAYER
+        self.p1_walls = self.walls_per_player
+        self.p2_walls = self.walls_per_player
         self.winner = None
-        self.history = [] 
-        self.redo_history = []
-        self._path_cache = {}
+        self.journal = _new_journal()
+        self._path_cache = OrderedDict() # LRU of distance maps by wall key, and of A* paths
+        self._fields = {row: DistanceField(self.geo, row) for row in (self.p1_goal, self.p2_goal)}
+        self.stats = GameStats()
+        self._zobrist = zobrist_table(self.geo, self.walls_per_player)
+        self.zkey = self._zobrist.key(self)
+        self.wkey = 0 # Zobrist key of the walls alone
+        self._legal_walls = frozenset()
+        self._legal_walls_key = None # zkey the legal wall set was computed for
+
+    def copy(self):
+        """Board-only copy (no undo history) that can be searched independently."""
+        clone = QuoridorGame.__new__(QuoridorGame)
+        clone.__dict__.update(self.__dict__)
+        clone.walls = list(self.walls)
+        clone.journal = _new_journal()
+        clone._path_cache = OrderedDict()
+        clone._fields = {row: field.copy() for row, field in self._fields.items()}
+        clone.stats = self.stats.copy()
+        return clone
 
-    def save_state(self):
-        """Create a clean snapshot of the board only."""
+    def __getstate__(self):
+        """Pickle the board only; lookup tables and distance fields are rebuilt on load."""
         state = self.__dict__.copy()
-        if 'history' in state: del state['history']
-        if 'redo_history' in state: del state['redo_history']
-        if '_path_cache' in state: del state['_path_cache']
-        return pickle.dumps(state)
+        for name in ('geo', '_zobrist', '_fields', '_path_cache', 'journal', '_legal_walls', '_legal_walls_key', 'stats'):
+            state.pop(name, None)
+        state['size'] = self.geo.size
+        return state
 
-    def restore_state(self, snapshot):
-        state_data = pickle.loads(snapshot)
-        self.__dict__.update(state_data)
-        self._path_cache = {} 
+    def __setstate__(self, state):
+        state = dict(state)
+        self.geo = geometry(state.pop('size'))
+        self.__dict__.update(state)
+        self.journal = _new_journal()
+        self._path_cache = OrderedDict()
+        self._zobrist = zobrist_table(self.geo, self.walls_per_player)
+        self.wkey = self._zobrist.wall_key(self.geo, self.walls)
+        self._fields = {row: DistanceField(self.geo, row, self.blocked) for row in (self.p1_goal, self.p2_goal)}
+        self._legal_walls = frozenset()
+        self._legal_walls_key = None
+        self.stats = GameStats()
 
     def is_wall_blocking(self, c1, c2, walls=None):
-        if walls is None: walls = self.walls
+        if walls is not None and walls is not self.walls:
+            return self._scan_wall_blocking(c1, c2, walls)
+        return bool(self.blocked & self.geo.edge_mask(c1, c2))
+
+    def _scan_wall_blocking(self, c1, c2, walls):
         x1, y1 = c1
         x2, y2 = c2
         
@@ -44,14 +90,70 @@ class QuoridorGame:
         return False
 
     def get_neighbors(self, pos, walls=None):
-        x, y = pos
-        moves = []
-        candidates = [(x, y-1), (x, y+1), (x-1, y), (x+1, y)]
-        for cx, cy in candidates:
-            if 0 <= cx < 9 and 0 <= cy < 9:
-                if not self.is_wall_blocking(pos, (cx, cy), walls):
-                    moves.append((cx, cy))
-        return moves
+        if walls is not None and walls is not self.walls:
+            x, y = pos
+            moves = []
+            candidates = [(x, y-1), (x, y+1), (x-1, y), (x+1, y)]
+            for cx, cy in candidates:
+                if 0 <= cx < self.geo.size and 0 <= cy < self.geo.size:
+                    if not self._scan_wall_blocking(pos, (cx, cy), walls):
+                        moves.append((cx, cy))
+            return moves
+        geo = self.geo
+        blocked = self.blocked
+        coords = geo.coords
+        return [coords[nc] for nc, edge in geo.neighbors[geo.cell(pos)] if not blocked & edge]
+
+    def _set_wall_bits(self, pos, orientation):
+        """Toggle a wall in the bitboards; walls never share slots or edges."""
+        slot = self.geo.slot(pos[0], pos[1])
+        if orientation == 'H': self.h_walls ^= 1 << slot
+        else: self.v_walls ^= 1 << slot
+        self.blocked ^= self.geo.wall_edges[orientation][slot]
+        return slot
+
+    def _place_wall(self, pos, orientation):
+        self.walls.append((pos, orientation))
+        slot = self._set_wall_bits(pos, orientation)
+        key = self._zobrist.wall[orientation][slot]
+        self.zkey ^= key
+        self.wkey ^= key
+        if not self._cached_fields():
+            pairs = self.geo.wall_pairs[orientation][slot]
+            for field in self._fields.values(): field.add_wall(self.blocked, pairs)
+            self._cache_put(self.wkey, tuple(field.dist for field in self._fields.values()))
+
+    def _remove_wall(self):
+        pos, orientation = self.walls.pop()
+        slot = self._set_wall_bits(pos, orientation)
+        key = self._zobrist.wall[orientation][slot]
+        self.zkey ^= key
+        self.wkey ^= key
+        if not self._cached_fields():
+            pairs = self.geo.wall_pairs[orientation][slot]
+            for field in self._fields.values(): field.remove_wall(self.blocked, pairs)
+            self._cache_put(self.wkey, tuple(field.dist for field in self._fields.values()))
+
+    def _cached_fields(self):
+        """Point the distance fields at the maps cached for the current walls, if any.
+
+        Maps are never mutated once built, so the fields can share them. The
+        cache outlives make/unmake, and sibling nodes that place the same
+        walls reuse each other's maps.
+        """
+        maps = self._path_cache.get(self.wkey)
+        if maps is None:
+            self.stats.field_cache_misses += 1
+            return False
+        self.stats.field_cache_hits += 1
+        self._path_cache.move_to_end(self.wkey)
+        for field, dist in zip(self._fields.values(), maps): field.dist = dist
+        return True
+
+    def _cache_put(self, key, value):
+        cache = self._path_cache
+        cache[key] = value
+        if len(cache) > GameConfig.PATH_CACHE_SIZE: cache.popitem(last=False)
 
     def get_valid_pawn_moves(self, player_id):
         if self.winner: return []
@@ -65,7 +167,7 @@ class QuoridorGame:
                 dx, dy = n[0] - curr_pos[0], n[1] - curr_pos[1]
                 jump_dest = (n[0] + dx, n[1] + dy)
                 can_jump_straight = False
-                if 0 <= jump_dest[0] < 9 and 0 <= jump_dest[1] < 9:
+                if 0 <= jump_dest[0] < self.geo.size and 0 <= jump_dest[1] < self.geo.size:
                     if not self.is_wall_blocking(n, jump_dest):
                         valid_moves.append(jump_dest)
                         can_jump_straight = True
@@ -77,9 +179,20 @@ class QuoridorGame:
         return valid_moves
 
     def shortest_path(self, start_pos, goal_row, walls=None):
+        self.stats.shortest_path_calls += 1
+        field = self._fields.get(goal_row)
+        if field is not None and (walls is None or walls is self.walls):
+            self.stats.path_field_hits += 1
+            coords = self.geo.coords
+            return [coords[c] for c in field.path(self.geo.cell(start_pos), self.blocked)]
+
         if walls is None: walls = self.walls
-        key = (start_pos, goal_row, frozenset(walls))
-        if key in self._path_cache: return self._path_cache[key]
+        key = (start_pos, goal_row, self._zobrist.wall_key(self.geo, walls))
+        if key in self._path_cache:
+            self.stats.path_cache_hits += 1
+            self._path_cache.move_to_end(key)
+            return self._path_cache[key]
+        self.stats.path_searches += 1
 
         open_heap = []
         heapq.heappush(open_heap, (abs(start_pos[1] - goal_row), 0, start_pos))
@@ -98,7 +211,7 @@ class QuoridorGame:
                     path.append(current)
                     current = came_from[current]
                 path.reverse()
-                self._path_cache[key] = path
+                self._cache_put(key, path)
                 return path
 
             for n in self.get_neighbors(current, walls):
@@ -108,102 +221,203 @@ class QuoridorGame:
                     came_from[n] = current
                     heapq.heappush(open_heap, (tg + abs(n[1] - goal_row), tg, n))
 
-        self._path_cache[key] = []
+        self._cache_put(key, [])
         return []
 
     def shortest_path_len(self, start_pos, goal_row, walls=None):
+        self.stats.shortest_path_len_calls += 1
+        field = self._fields.get(goal_row)
+        if field is not None and (walls is None or walls is self.walls):
+            self.stats.path_field_hits += 1
+            return field.dist[self.geo.cell(start_pos)]
         path = self.shortest_path(start_pos, goal_row, walls)
-        return len(path) - 1 if path else 999
+        return len(path) - 1 if path else UNREACHABLE
+
+    def path_edge_mask(self, player_id):
+        """Edge mask of ``player_id``'s current shortest path."""
+        pos, goal = (self.p1_pos, self.p1_goal) if player_id == 1 else (self.p2_pos, self.p2_goal)
+        return self._fields[goal].path_edges(self.geo.cell(pos), self.blocked)
+
+    def goal_distances(self, player_id):
+        """Steps from every cell to ``player_id``'s goal row, indexed by cell."""
+        return self._fields[self.p1_goal if player_id == 1 else self.p2_goal].dist
+
+    def path_lengths(self):
+        """Both players' shortest path lengths, as (p1, p2)."""
+        cell = self.geo.cell
+        return self._fields[self.p1_goal].dist[cell(self.p1_pos)], self._fields[self.p2_goal].dist[cell(self.p2_pos)]
+
+    def path_lengths_with_wall(self, code):
+        """``path_lengths`` with wall ``code`` added, or None if it overlaps or crosses a wall.
+
+        Wall counts and turn are not checked; a length of UNREACHABLE means
+        the wall is illegal because it cuts a player off.
+        """
+        geo = self.geo
+        pos, orientation = geo.move_walls[code - geo.num_cells]
+        conflict_h, conflict_v = geo.conflicts[orientation][geo.slot(pos[0], pos[1])]
+        if self.h_walls & conflict_h or self.v_walls & conflict_v: return None
+        self._place_wall(pos, orientation)
+        lengths = self.path_lengths()
+        self._remove_wall()
+        return lengths
 
     def get_hashable_state(self):
-        walls_key = tuple(sorted(self.walls))
-        return (self.p1_pos, self.p2_pos, self.p1_walls, self.p2_walls, walls_key, self.turn)
+        return self.zkey
 
     def is_valid_wall(self, x, y, orientation):
+        self.stats.wall_checks += 1
         if self.winner: return False
-        if not (0 <= x < 8 and 0 <= y < 8): return False
+        if not (0 <= x < self.geo.slots and 0 <= y < self.geo.slots): return False
         
-        for w_pos, w_orient in self.walls:
-            wx, wy = w_pos
-            if (wx, wy) == (x, y): return False 
-            if orientation == 'H' and w_orient == 'H' and wy == y and abs(wx - x) <= 1: return False
-            if orientation == 'V' and w_orient == 'V' and wx == x and abs(wy - y) <= 1: return False
-            if w_pos == (x, y) and w_orient != orientation: return False
+        slot = self.geo.slot(x, y)
+        conflict_h, conflict_v = self.geo.conflicts[orientation][slot]
+        if self.h_walls & conflict_h or self.v_walls & conflict_v: return False
 
         if self.turn == 1 and self.p1_walls <= 0: return False
         if self.turn == 2 and self.p2_walls <= 0: return False
 
-        self.walls.append(((x, y), orientation))
-        p1_len = self.shortest_path_len(self.p1_pos, 0, self.walls)
-        p2_len = self.shortest_path_len(self.p2_pos, 8, self.walls)
-        self.walls.pop()
+        # A wall that leaves both current shortest paths intact cannot disconnect anyone
+        if GameConfig.WALL_CHECK_PATH_CUT:
+            edges = self.geo.wall_edges[orientation][slot]
+            p1_edges = self._fields[self.p1_goal].path_edges(self.geo.cell(self.p1_pos), self.blocked)
+            p2_edges = self._fields[self.p2_goal].path_edges(self.geo.cell(self.p2_pos), self.blocked)
+            if not edges & (p1_edges | p2_edges):
+                self.stats.wall_path_miss += 1
+                return True
+            self.stats.wall_path_cut += 1
+
+        self._place_wall((x, y), orientation)
+        p1_len = self.shortest_path_len(self.p1_pos, self.p1_goal)
+        p2_len = self.shortest_path_len(self.p2_pos, self.p2_goal)
+        self._remove_wall()
         
-        return bool(p1_len < 999 and p2_len < 999)
+        return bool(p1_len < UNREACHABLE and p2_len < UNREACHABLE)
+
+    def legal_walls(self):
+        """Packed codes of every legal wall for the side to move.
+
+        Computed on first use for each position; any move, undo or redo
+        changes ``zkey`` and so invalidates it.
+        """
+        if self._legal_walls_key != self.zkey:
+            legal = []
+            if (self.p1_walls if self.turn == 1 else self.p2_walls) > 0:
+                for code, ((x, y), orient) in enumerate(self.geo.move_walls, self.geo.num_cells):
+                    if self.is_valid_wall(x, y, orient): legal.append(code)
+            self._legal_walls = frozenset(legal)
+            self._legal_walls_key = self.zkey
+        return self._legal_walls
+
+    def is_legal_wall(self, x, y, orientation):
+        if not (0 <= x < self.geo.slots and 0 <= y < self.geo.slots): return False
+        return self.geo.wall_code(x, y, orientation) in self.legal_walls()
+
+    def is_legal_move(self, code):
+        geo = self.geo
+        if code < geo.num_cells: return geo.coords[code] in self.get_valid_pawn_moves(self.turn)
+        return code in self.legal_walls()
 
     def apply_move(self, move, record_history=True):
-        self._path_cache.clear()
-        if len(self.history) > GameConfig.MAX_HISTORY:
-            del self.history[0: len(self.history) - GameConfig.MAX_HISTORY]
-        
-        if record_history:
-            self.history.append(self.save_state())
-            self.redo_history.clear()
-
-        if move['type'] == 'MOVE':
-            if self.turn == 1: self.p1_pos = move['dest']
-            else: self.p2_pos = move['dest']
-        elif move['type'] == 'WALL':
-            self.walls.append((move['pos'], move['orient']))
-            if self.turn == 1: self.p1_walls -= 1
-            else: self.p2_walls -= 1
-            
-        self.check_win()
-        self.turn = 2 if self.turn == 1 else 1
+        """Play a move given as a packed code or as a GUI dict.
+
+        With ``record_history=False`` the move joins the previous undo step,
+        so a human move and the AI reply are undone together.
+        """
+        if isinstance(move, dict): move = self.geo.encode(move)
+        prev_pos = self.p1_pos if self.turn == 1 else self.p2_pos
+        self.journal.record(move, self.geo.cell(prev_pos), record_history)
+        self.apply_move_fast(move)
 
     def apply_move_fast(self, move):
-        self._path_cache.clear()
-        undo_data = {'turn': self.turn, 'winner': self.winner}
-        if move['type'] == 'MOVE':
-            undo_data['type'] = 'MOVE'
-            undo_data['prev_pos'] = self.p1_pos if self.turn == 1 else self.p2_pos
-            if self.turn == 1: self.p1_pos = move['dest']
-            else: self.p2_pos = move['dest']
+        """Play a packed move code; returns the undo record for undo_move_fast."""
+        turn = self.turn
+        undo_data = (move, self.p1_pos if turn == 1 else self.p2_pos, turn, self.winner, self.zkey)
+        geo = self.geo
+        if move < geo.num_cells:
+            self._move_pawn(geo.coords[move])
         else:
-            undo_data['type'] = 'WALL'
-            self.walls.append((move['pos'], move['orient']))
-            if self.turn == 1: self.p1_walls -= 1
-            else: self.p2_walls -= 1
+            pos, orient = geo.move_walls[move - geo.num_cells]
+            self._place_wall(pos, orient)
+            self._spend_wall(-1)
         
         self.check_win()
-        self.turn = 2 if self.turn == 1 else 1
+        self.turn = 2 if turn == 1 else 1
+        self.zkey ^= self._zobrist.side
         return undo_data
 
     def undo_move_fast(self, undo_data):
-        self._path_cache.clear()
-        self.turn = undo_data['turn']
-        self.winner = undo_data['winner']
-        if undo_data['type'] == 'MOVE':
-            if self.turn == 1: self.p1_pos = undo_data['prev_pos']
-            else: self.p2_pos = undo_data['prev_pos']
+        move, prev_pos, turn, self.winner, key = undo_data
+        self.turn = turn
+        if move < self.geo.num_cells:
+            if turn == 1: self.p1_pos = prev_pos
+            else: self.p2_pos = prev_pos
         else:
-            self.walls.pop()
-            if self.turn == 1: self.p1_walls += 1
+            self._remove_wall()
+            if turn == 1: self.p1_walls += 1
             else: self.p2_walls += 1
+        self.zkey = key
+
+    def _move_pawn(self, dest):
+        pawn_keys = self._zobrist.pawn[self.turn]
+        if self.turn == 1:
+            self.zkey ^= pawn_keys[self.geo.cell(self.p1_pos)] ^ pawn_keys[self.geo.cell(dest)]
+            self.p1_pos = dest
+        else:
+            self.zkey ^= pawn_keys[self.geo.cell(self.p2_pos)] ^ pawn_keys[self.geo.cell(dest)]
+            self.p2_pos = dest
+
+    def _spend_wall(self, delta):
+        count_keys = self._zobrist.walls_left[self.turn]
+        if self.turn == 1:
+            self.zkey ^= count_keys[self.p1_walls] ^ count_keys[self.p1_walls + delta]
+            self.p1_walls += delta
+        else:
+            self.zkey ^= count_keys[self.p2_walls] ^ count_keys[self.p2_walls + delta]
+            self.p2_walls += delta
+
+    def _unplay(self, move, prev_cell):
+        """Invert a journalled ply; the game cannot have been won before it."""
+        self.turn = 2 if self.turn == 1 else 1
+        self.zkey ^= self._zobrist.side
+        self.winner = None
+        if move < self.geo.num_cells:
+            self._move_pawn(self.geo.coords[prev_cell])
+        else:
+            self._remove_wall()
+            self._spend_wall(1)
+
+    def _step_back(self):
+        move, prev_cell, new_step = self.journal.step_back()
+        self._unplay(move, prev_cell)
+        return new_step
+
+    def _step_forward(self):
+        self.apply_move_fast(self.journal.step_forward()[0])
+
+    @property
+    def ply(self):
+        return self.journal.dropped + self.journal.cursor
 
     def undo(self):
-        if self.history:
-            self.redo_history.append(self.save_state())
-            self.restore_state(self.history.pop())
-            return True
-        return False
+        if not self.journal.can_undo(): return False
+        while self.journal.can_undo() and not self._step_back(): pass
+        return True
 
     def redo(self):
-        if self.redo_history:
-            self.history.append(self.save_state())
-            self.restore_state(self.redo_history.pop())
-            return True
-        return False
+        if not self.journal.can_redo(): return False
+        self._step_forward()
+        while self.journal.can_redo() and not self.journal.next_starts_step(): self._step_forward()
+        return True
+
+    def jump_to_ply(self, ply):
+        """Undo or redo single plies until ``ply`` moves have been played."""
+        target = ply - self.journal.dropped
+        if not 0 <= target <= len(self.journal): return False
+        while self.journal.cursor > target: self._step_back()
+        while self.journal.cursor < target: self._step_forward()
+        return True
 
     def check_win(self):
-        if self.p1_pos[1] == 0: self.winner = 1
-        elif self.p2_pos[1] == 8: self.winner = 2
\ No newline at end of file
+        if self.p1_pos[1] == self.p1_goal: self.winner = 1
+        elif self.p2_pos[1] == self.p2_goal: self.winner = 2
\ No newline at end of file
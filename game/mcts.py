@@ -0,0 +1,187 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from config import GameConfig
+from game.ai import AI
+from game.distance import UNREACHABLE
+
+class _Node:
+    __slots__ = ('move', 'parent', 'player', 'key', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, parent, player, key):
+        self.move = move
+        self.parent = parent
+        self.player = player # who played ``move``; wins are counted for them
+        self.key = key
+        self.children = []
+        self.untried = None # moves not expanded yet, generated on first visit
+        self.visits = 0
+        self.wins = 0.0
+
+class MCTS(AI):
+    """UCT search with shortest-path-guided playouts, a drop-in for AI.
+
+    Playouts mostly step each pawn along its shortest path and now and then
+    drop a random legal wall; after ``MCTS_PLAYOUT_DEPTH`` plies the shorter
+    remaining race wins. The subtree of the position actually reached is
+    kept for the next call.
+    """
+
+    TT_MEGABYTES = 0 # the tree replaces the transposition table
+
+    def __init__(self, difficulty, time_budget=None, iterations=None, workers=None, use_book=True, seed=None):
+        super().__init__(difficulty, time_budget=time_budget, workers=1, use_book=use_book, seed=seed)
+        if iterations is None:
+            iterations = GameConfig.MCTS_ITERATIONS_EASY if difficulty == 1 else GameConfig.MCTS_ITERATIONS
+        self.iterations = iterations
+        self.exploration = GameConfig.MCTS_EXPLORATION
+        self.workers = workers if workers is not None else GameConfig.AI_WORKERS
+        self.reused = 0 # visits inherited from the previous search
+        self._root = None
+        self._pool = None
+        self._stop = None
+
+    def search_move(self, game):
+        self.nodes = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.best_move = None
+        if self.workers > 1: return self._parallel_move(game)
+
+        root = self._reuse(game)
+        self.search(game, root)
+        self._root = root
+        return self.best_move
+
+    def _reuse(self, game):
+        """Subtree for ``game`` from the last search (our move, then theirs), else a new root."""
+        old, self._root = self._root, None
+        self.reused = 0
+        if old is not None:
+            for child in old.children:
+                for grandchild in child.children:
+                    if grandchild.key == game.zkey:
+                        grandchild.parent = None
+                        self.reused = grandchild.visits
+                        return grandchild
+        return _Node(None, None, 2 if game.turn == 1 else 1, game.zkey)
+
+    def search(self, game, root):
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        c = self.exploration
+        while not self.iterations or self.nodes < self.iterations:
+            if self.stop_requested or (self.stop_flag is not None and self.stop_flag.value): break
+            if deadline is not None and self.nodes & 15 == 0 and time.perf_counter() >= deadline: break
+            node, line = root, []
+            while node.untried is not None and not node.untried and node.children:
+                log_n = math.log(node.visits)
+                node = max(node.children, key=lambda ch: ch.wins / ch.visits + c * math.sqrt(log_n / ch.visits))
+                line.append(game.apply_move_fast(node.move))
+            if not game.winner:
+                if node.untried is None:
+                    moves = self.get_all_moves(game, game.turn)
+                    moves.reverse()
+                    moves.sort(key=lambda m: m < game.geo.num_cells) # pawn moves, then the best walls, pop first
+                    node.untried = moves
+                if node.untried:
+                    player = game.turn
+                    line.append(game.apply_move_fast(node.untried.pop()))
+                    child = _Node(line[-1][0], node, player, game.zkey)
+                    node.children.append(child)
+                    node = child
+            self.completed_depth = max(self.completed_depth, len(line))
+            winner = self.playout(game)
+            while line: game.undo_move_fast(line.pop())
+            while node is not None:
+                node.visits += 1
+                if winner == node.player: node.wins += 1
+                elif not winner: node.wins += 0.5
+                node = node.parent
+            self.nodes += 1
+        if root.children:
+            self.best_move = max(root.children, key=lambda ch: ch.visits).move
+        return root
+
+    def playout(self, game):
+        """Winner of a guided playout from ``game``, which is restored afterwards."""
+        if game.winner: return game.winner
+        geo = game.geo
+        rng = self.rng
+        line = []
+        for _ in range(GameConfig.MCTS_PLAYOUT_DEPTH):
+            turn = game.turn
+            walls = game.p1_walls if turn == 1 else game.p2_walls
+            move = None
+            if walls and rng.random() < GameConfig.MCTS_WALL_RATE:
+                for _ in range(4):
+                    code = geo.num_cells + rng.randrange(2 * geo.num_slots)
+                    (x, y), orient = geo.move_walls[code - geo.num_cells]
+                    if game.is_valid_wall(x, y, orient):
+                        move = code
+                        break
+            if move is None:
+                dist = game.goal_distances(turn)
+                dests = game.get_valid_pawn_moves(turn)
+                if not dests: break
+                move = min((geo.cell(d) for d in dests), key=dist.__getitem__)
+            line.append(game.apply_move_fast(move))
+            if game.winner: break
+
+        winner = game.winner
+        if not winner:
+            d1 = game.shortest_path_len(game.p1_pos, game.p1_goal)
+            d2 = game.shortest_path_len(game.p2_pos, game.p2_goal)
+            if d1 < UNREACHABLE and d2 < UNREACHABLE:
+                # The side to move wins a tied race
+                if game.turn == 1: winner = 1 if d1 <= d2 else 2
+                else: winner = 2 if d2 <= d1 else 1
+        while line: game.undo_move_fast(line.pop())
+        return winner
+
+    def _parallel_move(self, game):
+        """Independent trees in each worker, merged by summing root visit counts."""
+        if self._pool is None:
+            ctx = multiprocessing.get_context('spawn')
+            self._stop = ctx.Value('b', 0)
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=ctx, initializer=_init_worker,
+                                             initargs=(self._stop, self.difficulty))
+        self._stop.value = 0
+        iterations = -(-self.iterations // self.workers) if self.iterations else 0
+        snapshot = game.copy()
+        futures = [self._pool.submit(_root_visits, snapshot, iterations, self.time_budget, self.rng.getrandbits(32))
+                   for _ in range(self.workers)]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            if self.stop_requested: self._stop.value = 1
+        visits = {}
+        for f in futures:
+            counts, nodes, depth = f.result()
+            self.nodes += nodes
+            self.completed_depth = max(self.completed_depth, depth)
+            for move, n in counts.items(): visits[move] = visits.get(move, 0) + n
+        if visits: self.best_move = max(visits, key=visits.get)
+        return self.best_move
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+# Per-process engine of pool workers
+_worker_mcts = None
+
+def _init_worker(stop_flag, difficulty):
+    global _worker_mcts
+    _worker_mcts = MCTS(difficulty, workers=1, use_book=False)
+    _worker_mcts.stop_flag = stop_flag
+
+def _root_visits(game, iterations, time_budget, seed):
+    engine = _worker_mcts
+    engine.rng.seed(seed)
+    engine.iterations = iterations
+    engine.time_budget = time_budget
+    engine.nodes = engine.completed_depth = 0
+    root = engine.search(game, _Node(None, None, 2 if game.turn == 1 else 1, game.zkey))
+    return {ch.move: ch.visits for ch in root.children}, engine.nodes, engine.completed_depth
@@ -0,0 +1,136 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from config import GameConfig
+from game.ai import AI, SearchTimeout
+
+# Per-process state of pool workers
+_worker_ai = None
+_shared_best = None
+
+def _init_worker(shared_best, stop_flag, difficulty):
+    global _worker_ai, _shared_best
+    _shared_best = shared_best
+    _worker_ai = AI(difficulty, time_budget=0, workers=1, use_book=False)
+    _worker_ai.stop_flag = stop_flag
+
+def _search_root_move(game, move, depth, maximizing, deadline, node_limit, settings):
+    """Search one root move; returns (score, exact, nodes), score None if aborted.
+
+    ``deadline`` is a ``time.perf_counter()`` value shared by the whole
+    iteration, so a job that waited in the queue gets only the time left.
+    The window is narrowed to the best score any worker has proven so far,
+    stored from the root player's point of view in ``_shared_best``.
+    """
+    ai = _worker_ai
+    seed = settings['seed']
+    ai.wall_movegen = settings['wall_movegen']
+    ai.wall_top_k = settings['wall_top_k']
+    ai.move_ordering = settings['move_ordering']
+    if seed is not None: ai.rng.seed(f"{seed}:{move}")
+    ai.nodes = 0
+    ai.stats.reset()
+    ai.new_search(game)
+    ai.completed_depth = 1 if deadline is not None or node_limit else 0
+    ai._deadline = deadline
+    ai.node_budget = node_limit
+    bound = _shared_best.value
+    alpha, beta = (bound, math.inf) if maximizing else (-math.inf, -bound)
+    game.apply_move_fast(move)
+    try:
+        score, _ = ai.minimax(game, depth - 1, alpha, beta, not maximizing, 1)
+    except SearchTimeout:
+        return None, False, ai.nodes
+    exact = score > alpha if maximizing else score < beta
+    if exact:
+        value = score if maximizing else -score
+        with _shared_best.get_lock():
+            if value > _shared_best.value: _shared_best.value = value
+    return score, exact, ai.nodes
+
+class ParallelSearch:
+    """Root-splitting iterative deepening over a process pool.
+
+    Every iteration hands each root move to a worker. Workers share the best
+    proven score so later moves are searched with a tighter window, and the
+    next iteration searches the root moves best-first.
+    """
+
+    def __init__(self, ai, workers):
+        self.ai = ai
+        self.workers = workers
+        self._pool = None
+        self._best = None
+        self._stop = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            ctx = multiprocessing.get_context('spawn')
+            self._best = ctx.Value('d', -math.inf)
+            self._stop = ctx.Value('b', 0)
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=ctx, initializer=_init_worker,
+                initargs=(self._best, self._stop, self.ai.difficulty))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _collect(self, futures, deadline):
+        """Results of ``futures``, or None once the search is stopped or ``deadline`` passes."""
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            if self.ai.stop_requested or (pending and deadline is not None and time.perf_counter() >= deadline):
+                self._stop.value = 1
+                for f in pending: f.cancel()
+                wait(pending)
+                return None
+        return [f.result() for f in futures]
+
+    def get_move(self, game):
+        ai = self.ai
+        ai.nodes = 0
+        ai.completed_depth = 0
+        ai.depth_times = []
+        ai.best_move = None
+        pool = self._ensure_pool()
+        self._stop.value = 0
+        start = time.perf_counter()
+
+        maximizing = game.turn == 2
+        ai.new_search(game)
+        moves = ai.get_all_moves(game, 2 if maximizing else 1)
+        ai.order_moves(game, moves, 2 if maximizing else 1, None, 0)
+        if not moves: return None
+        if len(moves) == 1: return moves[0]
+
+        snapshot = game.copy()
+        settings = ai.search_settings()
+        end = start + ai.time_budget if ai.time_budget else None
+        best_move = None
+        for depth in range(1, ai.max_depth + 1):
+            # The first iteration always completes, as in the serial search
+            deadline = end if depth > 1 else None
+            if deadline is not None and time.perf_counter() >= deadline: break
+            node_limit = ai.node_budget - ai.nodes if ai.node_budget and depth > 1 else None
+            self._best.value = -math.inf
+            futures = [pool.submit(_search_root_move, snapshot, m, depth, maximizing, deadline, node_limit, settings)
+                       for m in moves]
+            results = self._collect(futures, deadline)
+            if results is None: break
+            ai.nodes += sum(r[2] for r in results)
+            if any(r[0] is None for r in results): break
+
+            sign = 1 if maximizing else -1
+            ranked = sorted(zip(moves, results), key=lambda mr: (sign * mr[1][0], mr[1][1]), reverse=True)
+            moves = [m for m, _ in ranked]
+            best_move = ai.best_move = moves[0]
+            ai.completed_depth = depth
+            ai.depth_times.append(time.perf_counter() - start)
+            if abs(ranked[0][1][0]) >= GameConfig.WIN_SCORE: break
+            if ai.node_budget and ai.nodes >= ai.node_budget: break
+        return best_move
@@ -0,0 +1,150 @@
+"""Game records: one header line, then one move per line in Quoridor notation.
+
+    # quoridor 1 size=9 walls=10 mode=PVE ai=2
+    e2
+    e8
+    d3h
+    -
+
+Files run a-i from the left and ranks 1-9 up from player 1's side. A wall is
+named by the square south-west of its centre plus ``h`` or ``v``. A ``-`` line
+takes back the previous ply, so an autosave journal only ever appends;
+``compact_record`` turns one into a plain record.
+"""
+import os
+from config import GameConfig
+from game.logic import QuoridorGame
+
+VERSION = 1
+MAGIC = '# quoridor'
+UNDO = '-'
+
+class RecordError(ValueError):
+    pass
+
+def move_to_notation(geo, code):
+    if code < geo.num_cells:
+        x, y = geo.coords[code]
+        return f"{chr(97 + x)}{geo.size - y}"
+    (x, y), orient = geo.move_walls[code - geo.num_cells]
+    return f"{chr(97 + x)}{geo.size - y - 1}{orient.lower()}"
+
+def notation_to_move(geo, text):
+    """Packed move code for ``text``; raises RecordError if it is off the board."""
+    orient = text[-1].upper() if text[-1] in 'hv' else None
+    square = text[:-1] if orient else text
+    try:
+        x, rank = ord(square[0]) - 97, int(square[1:])
+    except (IndexError, ValueError):
+        raise RecordError(f"bad move {text!r}") from None
+    if orient is None:
+        if 0 <= x < geo.size and 1 <= rank <= geo.size: return geo.cell((x, geo.size - rank))
+    elif 0 <= x < geo.slots and 1 <= rank <= geo.slots:
+        return geo.wall_code(x, geo.size - rank - 1, orient)
+    raise RecordError(f"move {text!r} is off the board")
+
+def format_header(size, walls, **meta):
+    fields = ' '.join(f"{k}={v}" for k, v in meta.items() if v is not None)
+    return f"{MAGIC} {VERSION} size={size} walls={walls} {fields}".rstrip()
+
+def parse_header(line):
+    """Header fields with ``size``, ``walls`` and ``ai`` as ints; raises RecordError if malformed."""
+    if not line.startswith(MAGIC): raise RecordError("not a quoridor record")
+    try:
+        version, *fields = line[len(MAGIC):].split()
+        version = int(version)
+        header = dict(f.split('=', 1) for f in fields)
+        for key in ('size', 'walls'): header[key] = int(header[key])
+        if 'ai' in header: header['ai'] = int(header['ai'])
+    except (ValueError, KeyError) as e:
+        raise RecordError(f"bad record header {line!r}") from e
+    if version != VERSION: raise RecordError(f"unsupported record version {version}")
+    if header.get('mode', 'PVP') not in ('PVP', 'PVE'): raise RecordError(f"unknown mode {header['mode']!r}")
+    return header
+
+def read_record(path):
+    """Header dict and the move texts left after applying ``-`` take-backs."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            header = parse_header(f.readline().strip())
+            moves = []
+            for line in f:
+                line = line.strip()
+                if line == UNDO:
+                    if moves: moves.pop()
+                elif line:
+                    moves.append(line)
+    except UnicodeDecodeError as e:
+        raise RecordError(f"{path} is not a text record") from e
+    return header, moves
+
+def replay(header, moves):
+    """Rebuild a game from notation moves, validating every ply.
+
+    In PVE records the AI's replies join the human move's undo step, as they
+    do during play.
+    """
+    if not 3 <= header['size'] <= 26 or header['size'] % 2 == 0 or header['walls'] < 0:
+        raise RecordError(f"unsupported board: size {header['size']}, {header['walls']} walls")
+    game = QuoridorGame(header['size'], header['walls'])
+    pve = header.get('mode') == 'PVE'
+    for ply, text in enumerate(moves, 1):
+        code = notation_to_move(game.geo, text)
+        if game.winner or not game.is_legal_move(code): raise RecordError(f"illegal move {text!r} at ply {ply}")
+        game.apply_move(code, record_history=not (pve and game.turn == 2))
+    return game
+
+def load_record(path):
+    header, moves = read_record(path)
+    return header, replay(header, moves)
+
+def write_record(path, header, moves):
+    """Atomically replace ``path`` with a record of ``moves`` under the header dict ``header``."""
+    meta = dict(header)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(format_header(meta.pop('size'), meta.pop('walls'), **meta) + '\n')
+        for move in moves: f.write(move + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def compact_record(src, dst):
+    """Write the journal ``src`` to ``dst`` with its take-backs applied."""
+    header, moves = read_record(src)
+    write_record(dst, header, moves)
+
+class RecordWriter:
+    """Append-only autosave journal; fsyncs once every ``sync_every`` lines."""
+
+    def __init__(self, path, header, moves=(), sync_every=None):
+        self.path = path
+        self.sync_every = sync_every or GameConfig.AUTOSAVE_SYNC_EVERY
+        self._pending = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write(header + '\n')
+        self._write(moves)
+        self.sync()
+
+    def _write(self, lines):
+        for line in lines:
+            self._file.write(line + '\n')
+            self._pending += 1
+        self._file.flush()
+        if self._pending >= self.sync_every: self.sync()
+
+    def move(self, geo, code):
+        self._write([move_to_notation(geo, code)])
+
+    def undo(self, plies=1):
+        self._write([UNDO] * plies)
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
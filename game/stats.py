@@ -0,0 +1,124 @@
+import json
+import time
+from contextlib import contextmanager
+
+class GameStats:
+    """Call counters for the board's pathfinding and wall checks."""
+
+    FIELDS = ('shortest_path_calls', 'path_field_hits', 'path_cache_hits', 'path_searches',
+              'shortest_path_len_calls', 'wall_checks', 'wall_path_miss', 'wall_path_cut',
+              'field_cache_hits', 'field_cache_misses')
+    __slots__ = FIELDS
+
+    def __init__(self):
+        for name in self.FIELDS: setattr(self, name, 0)
+
+    def copy(self):
+        clone = GameStats()
+        for name in self.FIELDS: setattr(clone, name, getattr(self, name))
+        return clone
+
+    def field_cache_hit_rate(self):
+        lookups = self.field_cache_hits + self.field_cache_misses
+        return self.field_cache_hits / lookups if lookups else 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+class SearchStats:
+    """Telemetry for the last ``AI.get_move`` call, exported with ``as_dict``/``to_json``.
+
+    ``cutoffs[ply]`` counts beta cutoffs at each ply; the branching factor is
+    moves generated per expanded node. Game counters are the deltas of the
+    searched game's GameStats over the call. The fields are live while a
+    search runs; other threads should read ``last``, the dict of the most
+    recent finished call.
+    """
+
+    def __init__(self):
+        self.moves = 0 # get_move calls finished so far
+        self.last = None
+        self.reset()
+
+    def reset(self):
+        self.source = None # 'book', 'endgame' or 'search'
+        self.move = None
+        self.nodes = 0
+        self.depth = 0
+        self.depth_times = []
+        self.seconds = 0.0
+        self.phases = {}
+        self.movegen_seconds = 0.0
+        self.evaluate_seconds = 0.0
+        self.expanded = 0
+        self.generated = 0
+        self.cutoffs = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.game = {}
+        self._start = None
+        self._tt = (0, 0)
+        self._game = {}
+
+    def begin(self, game, transposition):
+        self.reset()
+        self._start = time.perf_counter()
+        self._tt = (transposition.probes, transposition.hits)
+        self._game = game.stats.as_dict()
+
+    def finish(self, ai, game, move, source):
+        self.seconds = time.perf_counter() - self._start
+        self.source = source
+        self.move = move
+        self.nodes = ai.nodes
+        self.depth = ai.completed_depth
+        self.depth_times = list(ai.depth_times)
+        self.tt_probes = ai.transposition.probes - self._tt[0]
+        self.tt_hits = ai.transposition.hits - self._tt[1]
+        self.game = {k: v - self._game.get(k, 0) for k, v in game.stats.as_dict().items()}
+        self.moves += 1
+        self.last = self.as_dict()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def cutoff(self, ply):
+        cutoffs = self.cutoffs
+        while len(cutoffs) <= ply: cutoffs.append(0)
+        cutoffs[ply] += 1
+
+    def branching_factor(self):
+        return self.generated / self.expanded if self.expanded else 0.0
+
+    def as_dict(self):
+        phases = dict(self.phases, movegen=self.movegen_seconds, evaluate=self.evaluate_seconds)
+        return {
+            'source': self.source,
+            'move': self.move,
+            'seconds': round(self.seconds, 4),
+            'nodes': self.nodes,
+            'nodes_per_second': round(self.nodes / self.seconds, 1) if self.seconds else None,
+            'depth': self.depth,
+            'depth_times': [round(t, 4) for t in self.depth_times],
+            'phases': {k: round(v, 4) for k, v in phases.items()},
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_hit_rate': round(self.tt_hits / self.tt_probes, 4) if self.tt_probes else 0.0,
+            'branching_factor': round(self.branching_factor(), 2),
+            'cutoffs_per_ply': list(self.cutoffs),
+            'path_cache_hit_rate': round(self._path_cache_hit_rate(), 4),
+            'game': self.game,
+        }
+
+    def _path_cache_hit_rate(self):
+        hits = self.game.get('field_cache_hits', 0) + self.game.get('path_cache_hits', 0)
+        misses = self.game.get('field_cache_misses', 0) + self.game.get('path_searches', 0)
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
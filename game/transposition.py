@@ -0,0 +1,72 @@
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed by Zobrist key.
+
+    Each bucket has a depth-preferred slot and an always-replace slot. Entries
+    are ``(depth, value, flag, best_move)`` where ``flag`` says whether the
+    value is exact or only a lower/upper bound from an alpha-beta cutoff.
+    """
+
+    ENTRY_BYTES = 160 # rough cost of one stored key + entry tuple in CPython
+
+    def __init__(self, megabytes):
+        buckets = 1
+        while buckets * 4 * self.ENTRY_BYTES <= megabytes * 1024 * 1024:
+            buckets *= 2
+        self.mask = buckets - 1
+        self.keys = [None] * (2 * buckets)
+        self.entries = [None] * (2 * buckets)
+        self.probes = 0
+        self.hits = 0
+        self.collisions = 0
+        self.overwrites = 0
+
+    def __len__(self):
+        return len(self.keys) - self.keys.count(None)
+
+    def clear(self):
+        size = len(self.keys)
+        self.keys = [None] * size
+        self.entries = [None] * size
+
+    def probe(self, key):
+        self.probes += 1
+        i = (key & self.mask) << 1
+        keys = self.keys
+        if keys[i] == key:
+            self.hits += 1
+            return self.entries[i]
+        if keys[i + 1] == key:
+            self.hits += 1
+            return self.entries[i + 1]
+        if keys[i] is not None or keys[i + 1] is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        i = (key & self.mask) << 1
+        keys, entries = self.keys, self.entries
+        entry = (depth, value, flag, move)
+        old_key = keys[i]
+        if old_key == key or old_key is None or depth >= entries[i][0]:
+            if old_key is not None and old_key != key:
+                # Demote the shallower result instead of dropping it
+                if keys[i + 1] is not None and keys[i + 1] != key: self.overwrites += 1
+                keys[i + 1], entries[i + 1] = old_key, entries[i]
+            elif keys[i + 1] == key:
+                keys[i + 1] = entries[i + 1] = None
+            keys[i], entries[i] = key, entry
+        else:
+            if keys[i + 1] is not None and keys[i + 1] != key: self.overwrites += 1
+            keys[i + 1], entries[i + 1] = key, entry
+
+    def stats(self):
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'collisions': self.collisions,
+            'overwrites': self.overwrites,
+            'used': len(self),
+            'capacity': len(self.keys),
+        }
@@ -0,0 +1,36 @@
+import threading
+
+class SearchWorker:
+    """Runs ``ai.get_move`` on a copy of the game in a background thread.
+
+    The caller polls ``done``/``progress()`` from its own loop and reads
+    ``result`` once finished. ``on_done`` is called from the worker thread.
+    """
+
+    def __init__(self, ai, game, on_done=None):
+        self.ai = ai
+        self.position_key = game.zkey
+        self.result = None
+        self.done = False
+        self.cancelled = False
+        self.on_done = on_done
+        self._snapshot = game.copy()
+        ai.stop_requested = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            move = self.ai.get_move(self._snapshot)
+            if not self.cancelled: self.result = move
+        finally:
+            self.done = True
+        if self.on_done and not self.cancelled: self.on_done(self)
+
+    def progress(self):
+        return self.ai.progress()
+
+    def cancel(self, wait=True):
+        self.cancelled = True
+        self.ai.stop_requested = True
+        if wait: self._thread.join()
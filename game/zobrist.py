@@ -0,0 +1,35 @@
+import random
+from functools import lru_cache
+
+class ZobristTable:
+    """64-bit random keys for pawn squares, wall slots, wall counts and side to move.
+
+    Seeded with a constant so keys are stable across processes and runs.
+    """
+
+    def __init__(self, geo, max_walls, seed=0x51D0):
+        rng = random.Random(seed)
+        rand = lambda: rng.getrandbits(64)
+        self.pawn = {p: [rand() for _ in range(geo.num_cells)] for p in (1, 2)}
+        self.wall = {o: [rand() for _ in range(geo.num_slots)] for o in ('H', 'V')}
+        self.walls_left = {p: [rand() for _ in range(max_walls + 1)] for p in (1, 2)}
+        self.side = rand()
+
+    def key(self, game):
+        geo = game.geo
+        k = self.pawn[1][geo.cell(game.p1_pos)] ^ self.pawn[2][geo.cell(game.p2_pos)]
+        k ^= self.wall_key(geo, game.walls)
+        k ^= self.walls_left[1][game.p1_walls] ^ self.walls_left[2][game.p2_walls]
+        if game.turn == 2: k ^= self.side
+        return k
+
+    def wall_key(self, geo, walls):
+        """The wall part of ``key``, which names a wall layout on its own."""
+        k = 0
+        for (x, y), orient in walls:
+            k ^= self.wall[orient][geo.slot(x, y)]
+        return k
+
+@lru_cache(maxsize=None)
+def zobrist_table(geo, max_walls):
+    return ZobristTable(geo, max_walls)
@@ -0,0 +1,114 @@
+import random
+import unittest
+from config import GameConfig
+from game.board import geometry
+from game.distance import DistanceField, UNREACHABLE
+from game.logic import QuoridorGame
+
+def bfs(geo, goal_row, blocked):
+    """Distance map by a plain BFS from the goal row, the reference for DistanceField."""
+    dist = [UNREACHABLE] * geo.num_cells
+    frontier = [goal_row * geo.size + x for x in range(geo.size)]
+    for c in frontier: dist[c] = 0
+    while frontier:
+        nxt = []
+        for c in frontier:
+            for nc, edge in geo.neighbors[c]:
+                if dist[nc] == UNREACHABLE and not blocked & edge:
+                    dist[nc] = dist[c] + 1
+                    nxt.append(nc)
+        frontier = nxt
+    return dist
+
+def legal_moves(game):
+    return [game.geo.cell(d) for d in game.get_valid_pawn_moves(game.turn)] + list(game.legal_walls())
+
+class DistanceFieldTest(unittest.TestCase):
+    def test_random_wall_sequences(self):
+        """Walls added and removed in any order, cutting cells off included."""
+        for size in (5, 9):
+            geo = geometry(size)
+            walls = [(o, slot) for o in ('H', 'V') for slot in range(geo.num_slots)]
+            for seed in range(20):
+                rng = random.Random(seed)
+                fields = [DistanceField(geo, 0), DistanceField(geo, size - 1)]
+                h = v = blocked = 0
+                placed = []
+                for _ in range(60):
+                    if placed and rng.random() < 0.35:
+                        o, slot = placed.pop(rng.randrange(len(placed)))
+                        adding = False
+                    else:
+                        o, slot = rng.choice(walls)
+                        conflict_h, conflict_v = geo.conflicts[o][slot]
+                        if h & conflict_h or v & conflict_v: continue
+                        placed.append((o, slot))
+                        adding = True
+                    if o == 'H': h ^= 1 << slot
+                    else: v ^= 1 << slot
+                    blocked ^= geo.wall_edges[o][slot]
+                    for field in fields:
+                        old = field.dist
+                        if adding: field.add_wall(blocked, geo.wall_pairs[o][slot])
+                        else: field.remove_wall(blocked, geo.wall_pairs[o][slot])
+                        self.assertEqual(field.dist, bfs(geo, field.goal_row, blocked), (size, seed))
+                        if field.dist is not old: self.assertIsNot(field.dist, old) # replaced, never mutated
+
+    def test_path_follows_the_gradient(self):
+        geo = geometry(9)
+        blocked = geo.wall_edges['H'][geo.slot(3, 3)] | geo.wall_edges['V'][geo.slot(4, 5)]
+        field = DistanceField(geo, 0, blocked)
+        start = geo.cell((4, 8))
+        path = field.path(start, blocked)
+        self.assertEqual((path[0], len(path) - 1), (start, field.dist[start]))
+        self.assertEqual(geo.coords[path[-1]][1], 0)
+        edges = field.path_edges(start, blocked)
+        for a, b in zip(path, path[1:]):
+            edge = geo.edge_mask(geo.coords[a], geo.coords[b])
+            self.assertFalse(blocked & edge)
+            self.assertTrue(edges & edge)
+
+class WallCheckTest(unittest.TestCase):
+    def tearDown(self):
+        GameConfig.WALL_CHECK_PATH_CUT = True
+
+    def connected_after(self, game, x, y, orient):
+        blocked = game.blocked | game.geo.wall_edges[orient][game.geo.slot(x, y)]
+        geo = game.geo
+        return (bfs(geo, game.p1_goal, blocked)[geo.cell(game.p1_pos)] < UNREACHABLE and
+                bfs(geo, game.p2_goal, blocked)[geo.cell(game.p2_pos)] < UNREACHABLE)
+
+    def test_path_cut_shortcut_matches_full_check(self):
+        slots = [(x, y, o) for y in range(8) for x in range(8) for o in ('H', 'V')]
+        for seed in range(8):
+            rng = random.Random(seed)
+            game = QuoridorGame(9, 10)
+            for _ in range(30):
+                if game.winner: break
+                for x, y, o in slots:
+                    GameConfig.WALL_CHECK_PATH_CUT = True
+                    fast = game.is_valid_wall(x, y, o)
+                    GameConfig.WALL_CHECK_PATH_CUT = False
+                    self.assertEqual(fast, game.is_valid_wall(x, y, o), (seed, x, y, o))
+                    conflict_h, conflict_v = game.geo.conflicts[o][game.geo.slot(x, y)]
+                    fits = not (game.h_walls & conflict_h or game.v_walls & conflict_v)
+                    fits = fits and (game.p1_walls if game.turn == 1 else game.p2_walls) > 0
+                    self.assertEqual(fast, fits and self.connected_after(game, x, y, o), (seed, x, y, o))
+                GameConfig.WALL_CHECK_PATH_CUT = True
+                walls = list(game.legal_walls())
+                pawns = [game.geo.cell(d) for d in game.get_valid_pawn_moves(game.turn)]
+                game.apply_move(rng.choice(walls) if walls and rng.random() < 0.6 else rng.choice(pawns))
+
+    def test_fields_stay_exact_through_make_and_unmake(self):
+        rng = random.Random(7)
+        game = QuoridorGame()
+        line = []
+        for _ in range(400):
+            if line and (game.winner or rng.random() < 0.4): game.undo_move_fast(line.pop())
+            else: line.append(game.apply_move_fast(rng.choice(legal_moves(game))))
+            for player in (1, 2):
+                goal = game.p1_goal if player == 1 else game.p2_goal
+                self.assertEqual(game.goal_distances(player), bfs(game.geo, goal, game.blocked))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import random
+import unittest
+from config import GameConfig
+from game.history import MoveJournal
+from game.logic import QuoridorGame
+
+def legal_moves(game):
+    return [game.geo.cell(d) for d in game.get_valid_pawn_moves(game.turn)] + list(game.legal_walls())
+
+def position(game):
+    return (game.p1_pos, game.p2_pos, sorted(game.walls), game.p1_walls, game.p2_walls, game.turn, game.winner,
+            game.zkey, game.goal_distances(1), game.goal_distances(2))
+
+def replayed(moves):
+    """Position after ``moves`` played on a fresh board."""
+    game = QuoridorGame()
+    for move in moves: game.apply_move_fast(move)
+    return position(game)
+
+def random_line(game, plies, seed, pve=False):
+    rng = random.Random(seed)
+    moves = []
+    for i in range(plies):
+        if game.winner: break
+        move = rng.choice(legal_moves(game))
+        game.apply_move(move, record_history=not (pve and i % 2))
+        moves.append(move)
+    return moves
+
+class MoveJournalTest(unittest.TestCase):
+    def test_packing(self):
+        journal = MoveJournal(4)
+        top = (1 << 11) - 1
+        for move, prev_cell, new_step in ((0, 0, False), (top, top, True), (top, 0, False), (456, 168, True)):
+            journal.record(move, prev_cell, new_step)
+            self.assertEqual(journal.step_back(), (move, prev_cell, new_step))
+            self.assertEqual(journal.step_forward(), (move, prev_cell, new_step))
+
+    def test_record_truncates_redo(self):
+        journal = MoveJournal(8)
+        for move in (1, 2, 3): journal.record(move, 0, True)
+        journal.step_back()
+        journal.step_back()
+        self.assertTrue(journal.can_redo())
+        journal.record(9, 0, True)
+        self.assertFalse(journal.can_redo())
+        self.assertEqual((len(journal), journal.moves()), (2, [1, 9]))
+
+class GameHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.max_history = GameConfig.MAX_HISTORY
+
+    def tearDown(self):
+        GameConfig.MAX_HISTORY = self.max_history
+
+    def test_undo_redo_and_jump_match_replay(self):
+        for seed in range(6):
+            game = QuoridorGame()
+            moves = random_line(game, 40, seed)
+            self.assertEqual(game.ply, len(moves))
+            for n in range(len(moves) - 1, -1, -1):
+                self.assertTrue(game.undo())
+                self.assertEqual(position(game), replayed(moves[:n]), (seed, n))
+            self.assertFalse(game.undo())
+            for n in range(1, len(moves) + 1):
+                self.assertTrue(game.redo())
+                self.assertEqual(position(game), replayed(moves[:n]), (seed, n))
+            self.assertFalse(game.redo())
+            rng = random.Random(seed)
+            for _ in range(10):
+                n = rng.randint(0, len(moves))
+                self.assertTrue(game.jump_to_ply(n))
+                self.assertEqual((game.ply, position(game)), (n, replayed(moves[:n])), (seed, n))
+            self.assertFalse(game.jump_to_ply(len(moves) + 1))
+
+    def test_step_flag_groups_plies(self):
+        game = QuoridorGame()
+        moves = random_line(game, 12, 3, pve=True)
+        self.assertEqual(len(moves), 12)
+        for n in (10, 8):
+            game.undo()
+            self.assertEqual((game.ply, position(game)), (n, replayed(moves[:n])))
+        game.redo()
+        self.assertEqual((game.ply, position(game)), (10, replayed(moves[:10])))
+        game.jump_to_ply(5) # mid-step, then a redo finishes the step
+        game.redo()
+        self.assertEqual((game.ply, position(game)), (6, replayed(moves[:6])))
+
+    def test_new_move_discards_redo(self):
+        game = QuoridorGame()
+        moves = random_line(game, 10, 4)
+        game.jump_to_ply(6)
+        other = next(m for m in legal_moves(game) if m != moves[6])
+        game.apply_move(other)
+        self.assertFalse(game.redo())
+        self.assertEqual(game.ply, 7)
+        self.assertEqual(position(game), replayed(moves[:6] + [other]))
+        game.undo()
+        self.assertEqual(position(game), replayed(moves[:6]))
+
+    def test_oldest_plies_fall_off(self):
+        GameConfig.MAX_HISTORY = 3
+        game = QuoridorGame()
+        moves = random_line(game, 11, 5, pve=True)
+        self.assertEqual(len(moves), 11)
+        journal = game.journal
+        self.assertEqual((journal.capacity, len(journal), journal.dropped, game.ply), (6, 6, 5, 11))
+        self.assertEqual(journal.moves(), moves[5:])
+        self.assertFalse(game.jump_to_ply(4))
+        self.assertTrue(game.jump_to_ply(5))
+        self.assertEqual(position(game), replayed(moves[:5]))
+        self.assertFalse(game.undo())
+        game.jump_to_ply(11)
+        self.assertEqual(position(game), replayed(moves))
+        undone = 0
+        while game.undo(): undone += 1
+        self.assertEqual((undone, game.ply), (4, 5)) # three whole steps, then the half whose first ply fell off
+        game.jump_to_ply(9)
+        game.apply_move(legal_moves(game)[0]) # recording after an undo must not drop more
+        self.assertEqual((len(journal), journal.dropped), (5, 5))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from game.logic import QuoridorGame
+from game.record import (RecordError, RecordWriter, compact_record, format_header, load_record, move_to_notation,
+                         notation_to_move, parse_header, read_record, replay)
+
+class RecordTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'game.qrd')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, data):
+        with open(self.path, 'wb') as f: f.write(data.encode() if isinstance(data, str) else data)
+
+    def test_notation_round_trip(self):
+        geo = QuoridorGame().geo
+        for code in range(geo.num_moves):
+            self.assertEqual(notation_to_move(geo, move_to_notation(geo, code)), code)
+
+    def test_writer_round_trip_with_undo(self):
+        game = QuoridorGame()
+        moves = ['e2', 'e8', 'd3h', 'e7']
+        writer = RecordWriter(self.path, format_header(9, 10, mode='PVE', ai=3), moves)
+        writer.undo()
+        writer.move(game.geo, notation_to_move(game.geo, 'f8'))
+        writer.close()
+
+        header, texts = read_record(self.path)
+        self.assertEqual(header, {'size': 9, 'walls': 10, 'mode': 'PVE', 'ai': 3})
+        self.assertEqual(texts, ['e2', 'e8', 'd3h', 'f8'])
+        header, game = load_record(self.path)
+        self.assertEqual((game.p1_pos, game.p2_pos, game.walls), ((4, 7), (5, 1), [((3, 5), 'H')]))
+
+    def test_compact_applies_take_backs(self):
+        game = QuoridorGame()
+        writer = RecordWriter(self.path, format_header(9, 10, mode='PVP'), ['e2', 'e8', 'd3h'])
+        writer.undo(2)
+        writer.move(game.geo, notation_to_move(game.geo, 'd8'))
+        writer.close()
+        saved = os.path.join(self.dir.name, 'saved.qrd')
+        compact_record(self.path, saved)
+        with open(saved) as f: self.assertEqual(f.read(), "# quoridor 1 size=9 walls=10 mode=PVP\ne2\nd8\n")
+
+    def test_zero_walls(self):
+        game = replay(parse_header("# quoridor 1 size=9 walls=0"), ['e2'])
+        self.assertEqual((game.p1_walls, game.p2_walls), (0, 0))
+        with self.assertRaises(RecordError): replay(parse_header("# quoridor 1 size=9 walls=0"), ['e2', 'd7h'])
+
+    def test_corrupt_headers(self):
+        for line in ("", "# chess 1 size=9 walls=10", "# quoridor", "# quoridor x size=9 walls=10",
+                     "# quoridor 2 size=9 walls=10", "# quoridor 1 size=9 walls", "# quoridor 1 walls=10",
+                     "# quoridor 1 size=nine walls=10", "# quoridor 1 size=9 walls=10 ai=x",
+                     "# quoridor 1 size=9 walls=10 mode=CHESS"):
+            with self.subTest(line=line), self.assertRaises(RecordError):
+                parse_header(line)
+
+    def test_corrupt_files(self):
+        for data in (b"", b"\xff\xfe\x00garbage\n", "# quoridor 1 size=9 walls=10\ne2\nzz\n",
+                     "# quoridor 1 size=9 walls=10\ne2\ne9\n", "# quoridor 1 size=8 walls=10\n",
+                     "# quoridor 1 size=9 walls=10\ne2\n\xe9\n".encode('latin-1')):
+            with self.subTest(data=data), self.assertRaises(RecordError):
+                self.write(data)
+                load_record(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
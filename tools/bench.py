@@ -0,0 +1,212 @@
+"""Benchmark and perft suite for move generation, pathfinding and search.
+
+    python -m tools.bench                          # run every suite, print JSON
+    python -m tools.bench perft --depth 2 --divide
+    python -m tools.bench all --out bench.json --baseline bench_baseline.json
+    python -m tools.bench all --save-baseline bench_baseline.json
+    python -m tools.bench sizes --sizes 9 11 13     # per-move cost against board size
+
+Perft counts must match the baseline exactly. Timings and rates fail the
+comparison when they are worse than the baseline by more than --threshold.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from game.ai import AI
+from game.logic import QuoridorGame
+from tools.positions import POSITIONS
+
+def legal_moves(game):
+    """Every legal move for the side to move: pawn moves plus all legal walls."""
+    geo = game.geo
+    moves = [geo.cell(dest) for dest in game.get_valid_pawn_moves(game.turn)]
+    for y in range(geo.slots):
+        for x in range(geo.slots):
+            for orient in ('H', 'V'):
+                if game.is_valid_wall(x, y, orient):
+                    moves.append(geo.wall_code(x, y, orient))
+    return moves
+
+def perft(game, depth):
+    if depth == 0 or game.winner: return 1
+    total = 0
+    for move in legal_moves(game):
+        undo = game.apply_move_fast(move)
+        total += perft(game, depth - 1)
+        game.undo_move_fast(undo)
+    return total
+
+def divide(game, depth):
+    counts = {}
+    for move in legal_moves(game):
+        undo = game.apply_move_fast(move)
+        counts[move_name(game.geo, move)] = perft(game, depth - 1)
+        game.undo_move_fast(undo)
+    return counts
+
+def move_name(geo, code):
+    move = geo.decode(code)
+    if move['type'] == 'MOVE': return f"move {move['dest'][0]},{move['dest'][1]}"
+    return f"wall {move['pos'][0]},{move['pos'][1]}{move['orient']}"
+
+def run_perft(depth, show_divide=False):
+    results = {}
+    for name, make in POSITIONS.items():
+        game = make()
+        start = time.perf_counter()
+        if show_divide:
+            counts = divide(game, depth)
+            nodes = sum(counts.values())
+            for move, count in sorted(counts.items()):
+                print(f"{name:<10}{move:<16}{count}", file=sys.stderr)
+        else:
+            nodes = perft(game, depth)
+        elapsed = time.perf_counter() - start
+        results[name] = {'depth': depth, 'nodes': nodes, 'seconds': round(elapsed, 4),
+                         'nodes_per_second': round(nodes / elapsed, 1)}
+    return results
+
+def _rate(fn, min_time=0.2):
+    """Calls per second of ``fn``, repeated until ``min_time`` has elapsed."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time: return round(calls / elapsed, 1)
+
+def run_micro():
+    results = {}
+    ai = AI(3, time_budget=0, workers=1, use_book=False)
+    for name, make in POSITIONS.items():
+        game = make()
+        size = game.geo.slots
+        slots = [(x, y, o) for y in range(size) for x in range(size) for o in ('H', 'V')]
+        def all_walls():
+            for x, y, o in slots: game.is_valid_wall(x, y, o)
+        results[name] = {
+            'shortest_path_per_second': _rate(lambda: game.shortest_path(game.p1_pos, game.p1_goal)),
+            'shortest_path_len_per_second': _rate(lambda: game.shortest_path_len(game.p2_pos, game.p2_goal)),
+            'is_valid_wall_per_second': round(_rate(all_walls) * len(slots), 1),
+            'evaluate_per_second': _rate(lambda: ai.evaluate(game)),
+        }
+    return results
+
+def run_search(depth, seed=1):
+    """Fixed-depth search of each position, with the node count the legacy move ordering needs."""
+    results = {}
+    for name, make in POSITIONS.items():
+        legacy = AI(3, time_budget=0, workers=1, use_book=False, seed=seed)
+        legacy.max_depth = depth
+        legacy.move_ordering = 'legacy'
+        legacy.get_move(make())
+
+        ai = AI(3, time_budget=0, workers=1, use_book=False, seed=seed)
+        ai.max_depth = depth
+        game = make()
+        start = time.perf_counter()
+        ai.get_move(game)
+        elapsed = time.perf_counter() - start
+        tt = ai.transposition.stats()
+        results[name] = {
+            'depth': ai.completed_depth,
+            'nodes': ai.nodes,
+            'seconds': round(elapsed, 4),
+            'nodes_per_second': round(ai.nodes / elapsed, 1) if elapsed else None,
+            'tt_hit_rate': round(tt['hits'] / tt['probes'], 4) if tt['probes'] else 0.0,
+            'time_to_depth': [round(t, 4) for t in ai.depth_times],
+            'legacy_ordering_nodes': legacy.nodes,
+            'node_ratio_vs_legacy': round(ai.nodes / legacy.nodes, 4) if legacy.nodes else None,
+        }
+    return results
+
+def run_sizes(sizes, depth, plies=12, seed=1):
+    """Move generation, evaluation and search cost on each board size.
+
+    Each board is searched from the position reached by the same seeded
+    random walk of ``plies`` legal moves.
+    """
+    results = {}
+    for size in sizes:
+        rng = random.Random(seed)
+        game = QuoridorGame(size)
+        for _ in range(plies):
+            if game.winner: break
+            game.apply_move(rng.choice(legal_moves(game)), record_history=False)
+        ai = AI(3, time_budget=0, workers=1, use_book=False)
+        ai.max_depth = depth
+        start = time.perf_counter()
+        ai.get_move(game)
+        elapsed = time.perf_counter() - start
+        results[str(size)] = {
+            'legal_moves': len(legal_moves(game)),
+            'movegen_per_second': _rate(lambda: legal_moves(game)),
+            'evaluate_per_second': _rate(lambda: ai.evaluate(game)),
+            'search_depth': ai.completed_depth,
+            'search_nodes': ai.nodes,
+            'search_seconds': round(elapsed, 4),
+            'nodes_per_second': round(ai.nodes / elapsed, 1) if elapsed else None,
+        }
+    return results
+
+# Metric name suffix -> True when larger is better
+_DIRECTION = {'per_second': True, 'seconds': False}
+
+def compare(results, baseline, threshold):
+    """List of human-readable regressions of ``results`` against ``baseline``."""
+    problems = []
+    def walk(new, old, path):
+        for key, old_val in old.items():
+            if key not in new: continue
+            new_val = new[key]
+            where = f"{path}.{key}" if path else key
+            if isinstance(old_val, dict):
+                walk(new_val, old_val, where)
+            elif path.startswith('perft') and key == 'nodes':
+                if new_val != old_val: problems.append(f"{where}: perft count {new_val} != baseline {old_val}")
+            elif isinstance(old_val, (int, float)) and old_val:
+                for suffix, higher_is_better in _DIRECTION.items():
+                    if not key.endswith(suffix): continue
+                    change = (new_val - old_val) / old_val
+                    if (change < -threshold) if higher_is_better else (change > threshold):
+                        problems.append(f"{where}: {new_val} vs baseline {old_val} ({change:+.1%})")
+    walk(results, baseline, '')
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('suite', nargs='?', default='all', choices=['all', 'perft', 'micro', 'search', 'sizes'])
+    parser.add_argument('--depth', type=int, default=2, help='perft depth')
+    parser.add_argument('--search-depth', type=int, default=3)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[9, 11, 13], help='board sizes for the sizes suite')
+    parser.add_argument('--divide', action='store_true', help='print per-root-move perft counts')
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--save-baseline', help='write results JSON as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative slowdown')
+    args = parser.parse_args()
+
+    results = {}
+    if args.suite in ('all', 'perft'): results['perft'] = run_perft(args.depth, args.divide)
+    if args.suite in ('all', 'micro'): results['micro'] = run_micro()
+    if args.suite in ('all', 'search'): results['search'] = run_search(args.search_depth)
+    if args.suite == 'sizes': results['sizes'] = run_sizes(args.sizes, args.search_depth)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, 'w') as f: f.write(text + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as f: baseline = json.load(f)
+        problems = compare(results, baseline, args.threshold)
+        for problem in problems: print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems: sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Build an opening book from deep searches of the positions near the start.
+
+    python -m tools.build_book --plies 6 --depth 4 --width 2 --out quoridor_book.qbk
+
+Every position within --plies of the start is searched to --depth and its
+best move is stored. The tree grows along that move plus the --width other
+moves that look best one ply ahead. Scores are from player 2's point of view,
+like AI.evaluate.
+"""
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+from config import GameConfig
+from game.ai import AI
+from game.book import write_book
+from game.logic import QuoridorGame
+
+def analyse(job):
+    game, depth, time_budget, width = job
+    ai = AI(3, time_budget=time_budget, workers=1, use_book=False)
+    ai.max_depth = depth
+    move = ai.get_move(game)
+    if move is None: return game.zkey, None, 0, 0, []
+    entry = ai.transposition.probe(game.zkey)
+    score = entry[1] if entry else ai.evaluate(game)
+
+    sign = 1 if game.turn == 2 else -1
+    ranked = []
+    for m in ai.get_all_moves(game, game.turn):
+        if m == move: continue
+        undo = game.apply_move_fast(m)
+        ranked.append((sign * ai.evaluate(game), m))
+        game.undo_move_fast(undo)
+    ranked.sort(reverse=True)
+    children = []
+    for m in [move] + [m for _, m in ranked[:width]]:
+        child = game.copy()
+        child.apply_move_fast(m)
+        if not child.winner: children.append(child)
+    return game.zkey, move, int(score), ai.completed_depth, children
+
+def build(plies, depth, time_budget, width, workers):
+    entries = {}
+    frontier = [QuoridorGame()]
+    with Pool(workers) as pool:
+        for ply in range(plies):
+            jobs = [(game, depth, time_budget, width) for game in frontier]
+            frontier = []
+            start = time.perf_counter()
+            for key, move, score, searched, children in pool.imap_unordered(analyse, jobs):
+                if move is not None: entries[key] = (move, score, searched)
+                frontier.extend(c for c in children if c.zkey not in entries)
+            frontier = list({g.zkey: g for g in frontier}.values())
+            print(f"ply {ply}: {len(jobs)} positions in {time.perf_counter() - start:.1f}s, "
+                  f"{len(entries)} entries", file=sys.stderr)
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--plies', type=int, default=6)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--time', type=float, default=0, help='seconds per position, 0 for depth-limited search')
+    parser.add_argument('--width', type=int, default=2, help='alternative moves expanded per position')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--out', default=GameConfig.BOOK_PATH)
+    args = parser.parse_args()
+
+    entries = build(args.plies, args.depth, args.time, args.width, args.workers)
+    game = QuoridorGame()
+    write_book(args.out, entries, game.geo.size, game.walls_per_player)
+    print(f"Wrote {len(entries)} positions to {args.out}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
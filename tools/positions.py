@@ -0,0 +1,37 @@
+"""Fixed positions shared by the benchmark tools."""
+from game.logic import QuoridorGame
+
+def _play(moves):
+    game = QuoridorGame()
+    for move in moves:
+        if move['type'] == 'MOVE': legal = move['dest'] in game.get_valid_pawn_moves(game.turn)
+        else: legal = game.is_valid_wall(move['pos'][0], move['pos'][1], move['orient'])
+        if not legal: raise ValueError(f"illegal move in fixed position: {move}")
+        game.apply_move(move, record_history=False)
+    return game
+
+def opening_position():
+    return _play([{'type': 'MOVE', 'dest': (4, 7)}])
+
+def midgame_position():
+    return _play([
+        {'type': 'MOVE', 'dest': (4, 7)}, {'type': 'MOVE', 'dest': (4, 1)},
+        {'type': 'WALL', 'pos': (3, 1), 'orient': 'H'}, {'type': 'WALL', 'pos': (4, 6), 'orient': 'H'},
+        {'type': 'MOVE', 'dest': (3, 7)}, {'type': 'MOVE', 'dest': (5, 1)},
+    ])
+
+def crowded_position():
+    return _play([
+        {'type': 'MOVE', 'dest': (4, 7)}, {'type': 'MOVE', 'dest': (4, 1)},
+        {'type': 'WALL', 'pos': (3, 1), 'orient': 'H'}, {'type': 'WALL', 'pos': (4, 6), 'orient': 'H'},
+        {'type': 'WALL', 'pos': (5, 1), 'orient': 'H'}, {'type': 'WALL', 'pos': (2, 6), 'orient': 'H'},
+        {'type': 'WALL', 'pos': (2, 2), 'orient': 'V'}, {'type': 'WALL', 'pos': (6, 5), 'orient': 'V'},
+        {'type': 'MOVE', 'dest': (3, 7)}, {'type': 'MOVE', 'dest': (5, 1)},
+        {'type': 'WALL', 'pos': (3, 3), 'orient': 'H'}, {'type': 'WALL', 'pos': (1, 6), 'orient': 'V'},
+    ])
+
+POSITIONS = {
+    'opening': opening_position,
+    'midgame': midgame_position,
+    'crowded': crowded_position,
+}
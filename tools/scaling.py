@@ -0,0 +1,61 @@
+"""Nodes/s of the root-parallel search against the number of pool workers.
+
+    python -m tools.scaling --depth 3 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import time
+from game.ai import AI
+from tools.positions import POSITIONS
+
+def measure(workers, depth, position):
+    ai = AI(3, time_budget=0, workers=workers, use_book=False)
+    ai.max_depth = depth
+    try:
+        if workers > 1: ai._parallel._ensure_pool() # keep process start-up out of the timing
+        game = POSITIONS[position]()
+        start = time.perf_counter()
+        move = ai.get_move(game)
+        elapsed = time.perf_counter() - start
+    finally:
+        ai.close()
+    return {
+        'position': position,
+        'workers': workers,
+        'depth': ai.completed_depth,
+        'nodes': ai.nodes,
+        'seconds': round(elapsed, 4),
+        'nodes_per_second': round(ai.nodes / elapsed, 1) if elapsed else None,
+        'move': move,
+    }
+
+def scaling_report(worker_counts, depth=3, positions=('opening', 'midgame')):
+    rows = []
+    for position in positions:
+        base = None
+        for workers in worker_counts:
+            row = measure(workers, depth, position)
+            if base is None: base = row['seconds']
+            row['speedup'] = round(base / row['seconds'], 2) if row['seconds'] else None
+            rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--json', action='store_true', help='print rows as JSON lines')
+    args = parser.parse_args()
+
+    if not args.json:
+        print(f"{'position':<10}{'workers':>8}{'depth':>6}{'nodes':>10}{'sec':>9}{'nodes/s':>11}{'speedup':>9}")
+    for row in scaling_report(args.workers, args.depth):
+        if args.json:
+            print(json.dumps(row))
+        else:
+            print(f"{row['position']:<10}{row['workers']:>8}{row['depth']:>6}{row['nodes']:>10}"
+                  f"{row['seconds']:>9.2f}{row['nodes_per_second']:>11.0f}{row['speedup']:>9.2f}")
+
+if __name__ == "__main__":
+    main()
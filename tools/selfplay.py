@@ -0,0 +1,152 @@
+"""Headless AI vs AI matches between two engine settings, spread over processes.
+
+    python -m tools.selfplay --games 200 --depth 2 3 --time 0 0 --out results.jsonl
+    python -m tools.selfplay --engine minimax mcts --time 1 1 --games 50
+    python -m tools.selfplay --movegen smart radius --time 0.5 0.5   # wall generators head to head
+
+Engine A and B swap colours every game. Each game opens with --random-plies
+moves drawn with its seed from the side to move's candidate moves, so
+deterministic engines still play different games. One JSON line per game
+is written to --out as soon as the game finishes.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from game.logic import QuoridorGame
+from game.ai import AI
+from game.mcts import MCTS
+
+def make_engine(kind, depth, time_budget, node_budget, use_book=True, movegen=None, seed=None):
+    """Engine for one side; for MCTS the node budget is the playout count and depth is unused."""
+    if kind == 'mcts':
+        ai = MCTS(3, time_budget=time_budget, iterations=node_budget or None, workers=1, use_book=use_book, seed=seed)
+    else:
+        ai = AI(3, time_budget=time_budget, node_budget=node_budget, workers=1, use_book=use_book, seed=seed)
+        ai.max_depth = depth
+    if movegen: ai.wall_movegen = movegen
+    return ai
+
+def play_game(job):
+    index, seed, engines, max_plies, random_plies = job
+    rng = random.Random(seed)
+    names = ('A', 'B') if index % 2 == 0 else ('B', 'A') # engine playing P1, P2
+    players = {1: make_engine(*engines[names[0]], seed=seed), 2: make_engine(*engines[names[1]], seed=seed + 1)}
+    game = QuoridorGame()
+    moves, nodes, seconds, depths = [], [], [], []
+    while not game.winner and len(moves) < min(random_plies, max_plies):
+        move = rng.choice(players[game.turn].get_all_moves(game, game.turn))
+        moves.append(move)
+        game.apply_move(move, record_history=False)
+    opening = len(moves)
+    resigned = None
+    while not game.winner and len(moves) < max_plies:
+        ai = players[game.turn]
+        start = time.perf_counter()
+        move = ai.get_move(game)
+        seconds.append(round(time.perf_counter() - start, 4))
+        nodes.append(ai.nodes)
+        depths.append(ai.completed_depth)
+        if move is None:
+            resigned = game.turn
+            break
+        moves.append(move)
+        game.apply_move(move, record_history=False)
+
+    winner = game.winner or ({1: 2, 2: 1}[resigned] if resigned else None)
+    return {
+        'game': index,
+        'seed': seed,
+        'p1': names[0],
+        'p2': names[1],
+        'winner': winner,
+        'winner_engine': names[winner - 1] if winner else None,
+        'plies': len(moves),
+        'random_plies': opening,
+        'nodes': nodes,
+        'seconds': seconds,
+        'depths': depths,
+        'moves': moves,
+        'book_moves': {1: players[1].book_hits, 2: players[2].book_hits},
+    }
+
+def elo_summary(wins, losses, draws):
+    """Elo difference of A over B with a 95% interval, from the match score."""
+    n = wins + losses + draws
+    if not n: return None
+    score = (wins + 0.5 * draws) / n
+    def elo(s):
+        s = min(max(s, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / s - 1)
+    var = (wins * (1 - score) ** 2 + losses * score ** 2 + draws * (0.5 - score) ** 2) / n
+    margin = 1.96 * math.sqrt(var / n)
+    return {'score': round(score, 4), 'elo': round(elo(score), 1),
+            'elo_low': round(elo(score - margin), 1), 'elo_high': round(elo(score + margin), 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--engine', nargs=2, default=['minimax', 'minimax'], metavar=('A', 'B'),
+                        choices=['minimax', 'mcts'])
+    parser.add_argument('--depth', type=int, nargs=2, default=[2, 2], metavar=('A', 'B'))
+    parser.add_argument('--time', type=float, nargs=2, default=[0, 0], metavar=('A', 'B'),
+                        help='seconds per move, 0 for depth-limited search')
+    parser.add_argument('--nodes', type=int, nargs=2, default=[0, 0], metavar=('A', 'B'))
+    parser.add_argument('--movegen', nargs=2, default=[None, None], metavar=('A', 'B'),
+                        choices=['smart', 'radius', 'all'], help='wall move generator, GameConfig.WALL_MOVEGEN by default')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--random-plies', type=int, default=4, help='seeded random opening moves per game')
+    parser.add_argument('--max-plies', type=int, default=200)
+    parser.add_argument('--no-book', action='store_true', help='search every move, ignoring the opening book')
+    parser.add_argument('--out', default='selfplay.jsonl')
+    args = parser.parse_args()
+
+    engines = {
+        'A': (args.engine[0], args.depth[0], args.time[0], args.nodes[0], not args.no_book, args.movegen[0]),
+        'B': (args.engine[1], args.depth[1], args.time[1], args.nodes[1], not args.no_book, args.movegen[1]),
+    }
+    jobs = [(i, args.seed + i, engines, args.max_plies, args.random_plies) for i in range(args.games)]
+    tally = {'A': 0, 'B': 0, None: 0}
+    total_nodes = total_seconds = total_moves = 0
+    engine_seconds = {'A': [0.0, 0], 'B': [0.0, 0]} # thinking time and moves per engine
+    start = time.perf_counter()
+    with open(args.out, 'w') as out, Pool(args.workers) as pool:
+        for done, record in enumerate(pool.imap_unordered(play_game, jobs), 1):
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+            tally[record['winner_engine']] += 1
+            total_nodes += sum(record['nodes'])
+            total_seconds += sum(record['seconds'])
+            total_moves += len(record['seconds'])
+            for ply, sec in enumerate(record['seconds'], record['random_plies']):
+                spent = engine_seconds[record['p1'] if ply % 2 == 0 else record['p2']]
+                spent[0] += sec
+                spent[1] += 1
+            elapsed = time.perf_counter() - start
+            print(f"\r{done}/{args.games} games  A {tally['A']}  B {tally['B']}  draws {tally[None]}"
+                  f"  {done / elapsed:.2f} games/s", end='', file=sys.stderr)
+    print(file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        'games': args.games,
+        'engines': args.engine,
+        'workers': args.workers,
+        'a_wins': tally['A'],
+        'b_wins': tally['B'],
+        'draws': tally[None],
+        'games_per_second': round(args.games / elapsed, 3),
+        'nodes_per_second': round(total_nodes / total_seconds, 1) if total_seconds else None,
+        'seconds_per_move': round(total_seconds / total_moves, 4) if total_moves else None,
+        'seconds_per_move_by_engine': {k: round(sec / n, 4) if n else None for k, (sec, n) in engine_seconds.items()},
+        'elo_a_minus_b': elo_summary(tally['A'], tally['B'], tally[None]),
+    }
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Cold-start benchmark: process start to first frame and to first AI move.
+
+    python -m tools.startup                     # both targets, 5 fresh processes each
+    python -m tools.startup engine --runs 20 --difficulty 3
+
+Every run spawns a new interpreter, like a batch worker does, and reports
+milliseconds from spawn to each milestone. The GUI runs on SDL's dummy
+video and audio drivers unless they are set already. The engine run fails
+if importing it pulls in pygame.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_ENGINE = """
+import json, sys, time
+marks = {'interpreter': time.time()}
+from game.logic import QuoridorGame
+from game.ai import AI
+marks['import'] = time.time()
+game = QuoridorGame()
+ai = AI(%d, use_book=False)
+ai.get_move(game)
+marks['first_move'] = time.time()
+marks['pygame_loaded'] = 'pygame' in sys.modules
+print(json.dumps(marks))
+"""
+
+_GUI = """
+import json, os, time
+marks = {'interpreter': time.time()}
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+from ui.gui import QuoridorGUI
+marks['import'] = time.time()
+app = QuoridorGUI()
+app.show_first_frame()
+marks['first_frame'] = time.time()
+app.assets.ready.wait()
+marks['assets'] = time.time()
+print(json.dumps(marks))
+"""
+
+def spawn(code):
+    """Milestones of one fresh interpreter running ``code``, in ms since spawn."""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    start = time.time()
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True).stdout
+    marks = json.loads(out.strip().splitlines()[-1])
+    return {k: ((v - start) * 1000 if isinstance(v, float) else v) for k, v in marks.items()}
+
+def run(target, runs, difficulty):
+    code = _ENGINE % difficulty if target == 'engine' else _GUI
+    samples = [spawn(code) for _ in range(runs)]
+    result = {}
+    for key in samples[0]:
+        values = [s[key] for s in samples]
+        if isinstance(values[0], bool): result[key] = any(values)
+        else: result[key] = {'median_ms': round(statistics.median(values), 1), 'min_ms': round(min(values), 1)}
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('target', nargs='?', default='all', choices=['all', 'engine', 'gui'])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--difficulty', type=int, default=1, help='AI level for the first move')
+    args = parser.parse_args()
+
+    targets = ['engine', 'gui'] if args.target == 'all' else [args.target]
+    results = {t: run(t, args.runs, args.difficulty) for t in targets}
+    print(json.dumps(results, indent=2))
+    if results.get('engine', {}).get('pygame_loaded'):
+        print("engine import pulled in pygame", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import pygame
+
+SOUNDS = [f"wood{i}.mp3" for i in range(1, 5)]
+IMAGES = {'pawn1': "pawn1.png", 'pawn2': "pawn2.png", 'logo': "logo.png"}
+MAX_SCALED = 32 # resized variants kept before the cache starts over
+
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+class Assets:
+    """Sounds and images decoded on a background thread.
+
+    Nothing is read until ``start``; the GUI draws its first frame without
+    assets and gets ``done_event`` posted once they are in. ``scaled``
+    caches each resized variant, so a redraw never rescales.
+    """
+
+    def __init__(self, done_event=None):
+        self.sounds = []
+        self.images = {}
+        self.ready = threading.Event()
+        self._done_event = done_event
+        self._scaled = {}
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load, name="asset-loader", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        sounds = []
+        try:
+            pygame.mixer.init()
+            for fname in SOUNDS:
+                try:
+                    sounds.append(pygame.mixer.Sound(resource_path(os.path.join('assets', 'audio', fname))))
+                except Exception:
+                    pass
+        except pygame.error:
+            pass # no audio device
+
+        images = {}
+        for name, fname in IMAGES.items():
+            try:
+                images[name] = pygame.image.load(resource_path(os.path.join('assets', 'images', fname)))
+            except Exception:
+                if name == 'logo': print("Warning: logo.png not found in assets/images/")
+        self.sounds, self.images = sounds, images
+        self.ready.set()
+        if self._done_event is not None and pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(self._done_event))
+
+    def image(self, name):
+        return self.images.get(name)
+
+    def scaled(self, name, size):
+        """``name`` smooth-scaled to ``size``, or None while it is not loaded."""
+        key = (name, size)
+        surf = self._scaled.get(key)
+        if surf is None:
+            img = self.images.get(name)
+            if img is None: return None
+            if len(self._scaled) >= MAX_SCALED: self._scaled.clear()
+            surf = pygame.transform.smoothscale(img, size)
+            if pygame.display.get_surface() is not None: surf = surf.convert_alpha()
+            self._scaled[key] = surf
+        return surf
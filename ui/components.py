@@ -7,12 +7,15 @@ class Button:
         self.text = text
         self.callback = callback
         self.hovered = False
+        self._label = None # (font, rendered text), re-rendered only when the font changes
 
     def draw(self, screen, font):
         color = Theme.BUTTON_HOVER if self.hovered else Theme.BUTTON_BG
         pygame.draw.rect(screen, color, self.rect, border_radius=8)
         
-        txt_surf = font.render(self.text, True, Theme.BUTTON_TEXT)
+        if self._label is None or self._label[0] is not font:
+            self._label = (font, font.render(self.text, True, Theme.BUTTON_TEXT))
+        txt_surf = self._label[1]
         screen.blit(txt_surf, (self.rect.centerx - txt_surf.get_width()//2, self.rect.centery - txt_surf.get_height()//2))
 
     def handle_event(self, event):
@@ -1,14 +1,17 @@
 import pygame
 import pygame.gfxdraw
-import pickle
 import os
 import sys
 import random
 import ctypes
 from config import Theme, Layout, GameConfig
+from ui.assets import Assets
 from ui.components import Button
 from game.logic import QuoridorGame
 from game.ai import AI
+from game.worker import SearchWorker
+from game.record import (RecordWriter, RecordError, read_record, replay, format_header, compact_record,
+                         move_to_notation)
 
 # High-DPI Fix
 try:
@@ -16,12 +19,8 @@ try:
 except Exception:
     pass
 
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+AI_DONE_EVENT = pygame.USEREVENT + 1
+ASSETS_LOADED_EVENT = pygame.USEREVENT + 2
 
 def draw_aa_circle(surface, x, y, r, color):
     pygame.gfxdraw.aacircle(surface, x, y, r, color)
@@ -29,40 +28,14 @@ def draw_aa_circle(surface, x, y, r, color):
 
 class QuoridorGUI:
     def __init__(self):
-        pygame.init()
-        pygame.mixer.init()
-        
-        # Audio
-        self.wood_sounds = []
-        for i in range(1, 5):
-            filename = f"wood{i}.mp3"
-            try:
-                path = resource_path(os.path.join('assets', 'audio', filename))
-                sound = pygame.mixer.Sound(path)
-                self.wood_sounds.append(sound)
-            except Exception:
-                pass
-
-        # Pawn Images
-        self.pawn_imgs = {1: None, 2: None}
+        # Only what the first frame needs; the mixer starts with the asset loader
+        pygame.display.init()
+        pygame.font.init()
+
+        # Sounds and images load in the background after the first frame
+        self.assets = Assets(ASSETS_LOADED_EVENT)
         self.pawn_imgs_scaled = {1: None, 2: None}
-        for pid in [1, 2]:
-            fname = f"pawn{pid}.png"
-            try:
-                path = resource_path(os.path.join('assets', 'images', fname))
-                self.pawn_imgs[pid] = pygame.image.load(path)
-            except Exception:
-                pass
-
-        # Logo Image
-        self.logo_img = None
         self.logo_scaled = None
-        try:
-            path = resource_path(os.path.join('assets', 'images', 'logo.png'))
-            self.logo_img = pygame.image.load(path)
-            pygame.display.set_icon(self.logo_img) 
-        except Exception:
-            print("Warning: logo.png not found in assets/images/")
 
         # Initialize Layout
         Layout.update(Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT)
@@ -80,9 +53,24 @@ class QuoridorGUI:
         self.game_mode = "PVP"
         self.current_difficulty = 1
         self.ai = None
+        self.ai_worker = None
+        self.recorder = None
+        self.show_stats = False # F3 toggles the engine stats overlay
+        self.stats_panel = None
         self.game = None
         self.wall_orientation = 'H' 
         self.running = True
+
+        # Render caches
+        self._text_cache = {}
+        self._preview_surfs = {}
+        self.board_layer = None # background, board, cells and placed walls
+        self._board_key = None
+        self.dim_overlay = None
+        self._region_sigs = {}
+        self._full_redraw = True
+        self._moves_key = None # zkey the cached pawn moves belong to
+        self._valid_moves = []
         
         self.setup_menu()
         self.setup_game_ui()
@@ -99,7 +87,7 @@ class QuoridorGUI:
             ("Player vs AI (Easy)", lambda: self.start_game("PVE", 1)),
             ("Player vs AI (Hard)", lambda: self.start_game("PVE", 3)),
             ("Load Game", self.load_game),
-            ("Exit", sys.exit)
+            ("Exit", self.exit_game)
         ]
         self.menu_buttons = [] 
 
@@ -109,7 +97,7 @@ class QuoridorGUI:
             ("Save", self.save_game),
             ("Undo", self.do_undo),
             ("Redo", self.do_redo),
-            ("Exit", sys.exit)
+            ("Exit", self.exit_game)
         ]
         self.game_buttons = []
         self.rematch_btn = None
@@ -118,30 +106,31 @@ class QuoridorGUI:
     def recalculate_ui(self):
         w, h = Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT
         cx, cy = w // 2, h // 2
+        if self.game and self.game.geo.size != Layout.BOARD_SIZE:
+            Layout.update(w, h, self.game.geo.size)
         
         # Scale Images (Pawns)
         target_size = int(Layout.CELL_SIZE * 0.8)
         for pid in [1, 2]:
-            if self.pawn_imgs[pid]:
-                self.pawn_imgs_scaled[pid] = pygame.transform.smoothscale(
-                    self.pawn_imgs[pid], (target_size, target_size)
-                )
+            self.pawn_imgs_scaled[pid] = self.assets.scaled(f'pawn{pid}', (target_size, target_size))
 
         # Scale Logo
         logo_h = 0
-        if self.logo_img:
+        self.logo_scaled = None
+        logo_img = self.assets.image('logo')
+        if logo_img:
             # Scale logo to 50% of screen width, maintaining aspect ratio
             target_w = int(w * 0.5)
-            ratio = target_w / self.logo_img.get_width()
-            target_h = int(self.logo_img.get_height() * ratio)
+            ratio = target_w / logo_img.get_width()
+            target_h = int(logo_img.get_height() * ratio)
             
             # Cap height if it gets too tall (max 25% of screen height)
             if target_h > h * 0.25:
                 target_h = int(h * 0.25)
-                ratio = target_h / self.logo_img.get_height()
-                target_w = int(self.logo_img.get_width() * ratio)
+                ratio = target_h / logo_img.get_height()
+                target_w = int(logo_img.get_width() * ratio)
                 
-            self.logo_scaled = pygame.transform.smoothscale(self.logo_img, (target_w, target_h))
+            self.logo_scaled = self.assets.scaled('logo', (target_w, target_h))
             logo_h = target_h
 
         # Menu Buttons Layout
@@ -162,7 +151,7 @@ class QuoridorGUI:
 
         # Game Buttons Layout
         self.game_buttons = []
-        board_real_w = (9 * Layout.CELL_SIZE) + (8 * Layout.GAP_SIZE)
+        board_real_w = (Layout.BOARD_SIZE * Layout.CELL_SIZE) + ((Layout.BOARD_SIZE - 1) * Layout.GAP_SIZE)
         Layout.MARGIN_X = (w - board_real_w) // 2
         is_wide_layout = w > (h + 200) 
 
@@ -193,19 +182,88 @@ class QuoridorGUI:
         rm_w, rm_h = 200, 60
         self.rematch_btn = Button("Rematch", cx - rm_w//2, cy + 50, rm_w, rm_h, self.restart_game)
         self.menu_overlay_btn = Button("Menu", cx - rm_w//2, cy + 120, rm_w, rm_h, self.return_to_menu)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop size-dependent surfaces and repaint the whole window next frame."""
+        self._board_key = None
+        self._preview_surfs.clear()
+        self.dim_overlay = None
+        self._region_sigs = {}
+        self._full_redraw = True
+
+    def render_text(self, font, text, color):
+        key = (font, text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) > 256: self._text_cache.clear()
+            surf = self._text_cache[key] = font.render(text, True, color)
+        return surf
 
     def play_sound(self):
-        if self.wood_sounds:
-            random.choice(self.wood_sounds).play()
+        if self.assets.sounds:
+            random.choice(self.assets.sounds).play()
+
+    def start_ai_search(self):
+        self.ai_worker = SearchWorker(self.ai, self.game,
+                                      on_done=lambda _: pygame.event.post(pygame.event.Event(AI_DONE_EVENT)))
+
+    def cancel_ai_search(self):
+        if self.ai_worker:
+            self.ai_worker.cancel()
+            self.ai_worker = None
+
+    def set_ai(self, ai):
+        """Swap in a new AI, shutting down the old one's worker processes."""
+        if self.ai: self.ai.close()
+        self.ai = ai
+
+    def ai_turn(self):
+        return self.state == "GAME" and not self.game.winner and self.game_mode == "PVE" and self.game.turn == 2
+
+    def update_ai(self):
+        if self.ai_worker is None:
+            self.start_ai_search()
+            return
+        worker = self.ai_worker
+        if not worker.done: return
+        self.ai_worker = None
+        if worker.position_key != self.game.zkey: return
+        if worker.result is not None:
+            self.play_move(worker.result, record_history=False)
+            self.play_sound()
+        else:
+            print("AI Resigns")
+
+    def play_move(self, move, record_history=True):
+        if isinstance(move, dict): move = self.game.geo.encode(move)
+        self.game.apply_move(move, record_history)
+        if self.recorder: self.recorder.move(self.game.geo, move)
+
+    def start_recording(self, moves=()):
+        if self.recorder: self.recorder.close()
+        header = format_header(self.game.geo.size, self.game.walls_per_player,
+                               mode=self.game_mode, ai=self.ai.difficulty if self.ai else None)
+        try:
+            self.recorder = RecordWriter(GameConfig.AUTOSAVE_PATH, header, moves)
+        except OSError as e:
+            self.recorder = None
+            print(f"Autosave disabled: {e}")
+
+    def exit_game(self):
+        self.cancel_ai_search()
+        self.set_ai(None)
+        if self.recorder: self.recorder.close()
+        self.running = False
+        sys.exit()
 
     def start_game(self, mode, difficulty=1):
+        self.cancel_ai_search()
         self.game = QuoridorGame()
         self.game_mode = mode
         self.current_difficulty = difficulty
-        if mode == "PVE":
-            self.ai = AI(difficulty)
-        else:
-            self.ai = None
+        self.set_ai(AI(difficulty) if mode == "PVE" else None)
+        self.start_recording()
         self.state = "GAME"
         self.recalculate_ui()
 
@@ -213,44 +271,51 @@ class QuoridorGUI:
         self.start_game(self.game_mode, self.current_difficulty)
 
     def return_to_menu(self):
+        self.cancel_ai_search()
         self.state = "MENU"
         self.recalculate_ui()
 
     def save_game(self):
-        if self.game:
-            with open("quoridor_save.pkl", "wb") as f:
-                data = {
-                    'game_state': self.game.__dict__,
-                    'mode': self.game_mode,
-                    'ai_diff': self.ai.difficulty if self.ai else None
-                }
-                pickle.dump(data, f)
-            print("Game Saved")
+        if not self.recorder:
+            print("Cannot save: autosave is disabled")
+            return
+        try:
+            self.recorder.sync()
+            compact_record(GameConfig.AUTOSAVE_PATH, GameConfig.SAVE_PATH)
+        except (OSError, RecordError) as e:
+            print(f"Could not save: {e}")
+            return
+        print("Game Saved")
 
     def load_game(self):
-        if os.path.exists("quoridor_save.pkl"):
-            with open("quoridor_save.pkl", "rb") as f:
-                data = pickle.load(f)
-                self.game = QuoridorGame()
-                self.game.__dict__ = data['game_state']
-                self.game_mode = data['mode']
-                if self.game_mode == "PVE":
-                    self.ai = AI(data['ai_diff'])
-                    self.current_difficulty = data['ai_diff']
-                self.state = "GAME"
-                self.recalculate_ui()
+        if not os.path.exists(GameConfig.SAVE_PATH): return
+        try:
+            header, moves = read_record(GameConfig.SAVE_PATH)
+            game = replay(header, moves)
+        except (OSError, RecordError) as e:
+            print(f"Could not load save: {e}")
+            return
+        self.cancel_ai_search()
+        self.game = game
+        self.game_mode = header.get('mode', 'PVP')
+        self.set_ai(None)
+        if self.game_mode == "PVE":
+            self.current_difficulty = header.get('ai', 1)
+            self.set_ai(AI(self.current_difficulty))
+        self.start_recording(moves)
+        self.state = "GAME"
+        self.recalculate_ui()
 
     def do_undo(self):
-        if self.game_mode == "PVP":
-            self.game.undo()
-        else:
-            self.game.undo()
+        self.cancel_ai_search()
+        ply = self.game.ply
+        if self.game.undo() and self.recorder: self.recorder.undo(ply - self.game.ply)
 
     def do_redo(self):
-        if self.game_mode == "PVP":
-            self.game.redo()
-        else:
-            self.game.redo()
+        self.cancel_ai_search()
+        cursor = self.game.journal.cursor
+        if self.game.redo() and self.recorder:
+            for move in self.game.journal.moves(cursor): self.recorder.move(self.game.geo, move)
 
     def to_screen_coords(self, grid_x, grid_y):
         px = Layout.MARGIN_X + grid_x * (Layout.CELL_SIZE + Layout.GAP_SIZE)
@@ -258,7 +323,7 @@ class QuoridorGUI:
         return px, py
 
     def get_interaction_target(self, screen_x, screen_y):
-        board_w = (9 * Layout.CELL_SIZE) + (8 * Layout.GAP_SIZE)
+        board_w = (Layout.BOARD_SIZE * Layout.CELL_SIZE) + ((Layout.BOARD_SIZE - 1) * Layout.GAP_SIZE)
         if not (Layout.MARGIN_X <= screen_x <= Layout.MARGIN_X + board_w and
                 Layout.MARGIN_Y <= screen_y <= Layout.MARGIN_Y + board_w):
             return {'type': 'NONE'}
@@ -271,7 +336,7 @@ class QuoridorGUI:
         fy = ry / unit
         gx, gy = int(fx), int(fy)
         
-        if gx < 0 or gx > 8 or gy < 0 or gy > 8: return {'type': 'NONE'}
+        if gx < 0 or gx >= Layout.BOARD_SIZE or gy < 0 or gy >= Layout.BOARD_SIZE: return {'type': 'NONE'}
 
         frac_x = fx - gx
         frac_y = fy - gy
@@ -294,6 +359,10 @@ class QuoridorGUI:
         return {'type': 'MOVE', 'grid': (gx, gy)}
 
     def draw_menu(self):
+        sig = tuple(btn.hovered for btn in self.menu_buttons)
+        if not self._full_redraw and self._region_sigs.get('menu') == sig: return []
+        self._full_redraw = False
+        self._region_sigs = {'menu': sig}
         self.screen.fill(Theme.BACKGROUND)
         
         # Draw Logo if available
@@ -303,28 +372,109 @@ class QuoridorGUI:
             self.screen.blit(self.logo_scaled, (lx, ly))
         else:
             # Fallback Text
-            title = self.font_lg.render("QUORIDOR", True, Theme.BUTTON_TEXT)
+            title = self.render_text(self.font_lg, "QUORIDOR", Theme.BUTTON_TEXT)
             self.screen.blit(title, (Layout.SCREEN_WIDTH//2 - title.get_width()//2, Layout.SCREEN_HEIGHT//5))
             
         for btn in self.menu_buttons:
             btn.draw(self.screen, self.font_md)
+        return [self.screen.get_rect()]
 
-    def draw_game(self):
-        self.screen.fill(Theme.BACKGROUND)
-        
-        turn_col = Theme.BUTTON_TEXT
-        status_text = f"Player {self.game.turn}'s Turn"
+    def board_rect(self):
+        board_w = Layout.BOARD_SIZE*Layout.CELL_SIZE + (Layout.BOARD_SIZE - 1)*Layout.GAP_SIZE
+        return pygame.Rect(Layout.MARGIN_X - 10, Layout.MARGIN_Y - 10, board_w + 20, board_w + 20)
+
+    def wall_rect(self, x, y, orientation):
+        px, py = self.to_screen_coords(x, y)
+        if orientation == 'H':
+            return pygame.Rect(px, py + Layout.CELL_SIZE, (Layout.CELL_SIZE * 2) + Layout.GAP_SIZE, Layout.GAP_SIZE)
+        return pygame.Rect(px + Layout.CELL_SIZE, py, Layout.GAP_SIZE, (Layout.CELL_SIZE * 2) + Layout.GAP_SIZE)
+
+    def update_board_layer(self):
+        """Rebuild the static layer when the window size or the walls change."""
+        key = (Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT, self.game.h_walls, self.game.v_walls)
+        if key == self._board_key: return
+        self._board_key = key
+        layer = pygame.Surface((Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT)).convert()
+        layer.fill(Theme.BACKGROUND)
+        pygame.draw.rect(layer, Theme.BOARD_BG, self.board_rect(), border_radius=8)
+        for y in range(Layout.BOARD_SIZE):
+            for x in range(Layout.BOARD_SIZE):
+                px, py = self.to_screen_coords(x, y)
+                pygame.draw.rect(layer, Theme.CELL_BG, (px, py, Layout.CELL_SIZE, Layout.CELL_SIZE), border_radius=4)
+        for (x, y), orientation in self.game.walls:
+            pygame.draw.rect(layer, Theme.WALL_PLACED, self.wall_rect(x, y, orientation), border_radius=2)
+        self.board_layer = layer
+
+    def valid_pawn_moves(self):
+        if self._moves_key != self.game.zkey:
+            self._moves_key = self.game.zkey
+            self._valid_moves = self.game.get_valid_pawn_moves(self.game.turn)
+        return self._valid_moves
+
+    def status_text(self):
         if self.game_mode == "PVE" and self.game.turn == 2:
-            status_text = "AI Thinking..."
-            
-        txt = self.font_lg.render(status_text, True, turn_col)
+            depth = self.ai_worker.progress()['depth'] if self.ai_worker else 0
+            return f"AI Thinking... (depth {depth})" if depth else "AI Thinking..."
+        return f"Player {self.game.turn}'s Turn"
+
+    def draw_game(self):
+        """Repaint the regions whose contents changed; returns the dirty rects."""
+        game = self.game
+        self.update_board_layer()
+        human_turn = (self.game_mode == "PVP") or (self.game_mode == "PVE" and game.turn == 1)
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        target = self.get_interaction_target(mouse_x, mouse_y)
+        valid_moves = self.valid_pawn_moves() if not game.winner and human_turn else []
+        hover = None
+        if target['type'] == 'MOVE' and target['grid'] in valid_moves:
+            hover = target['grid']
+        elif target['type'] == 'WALL' and human_turn and not game.winner:
+            gx, gy = target['grid']
+            if gx < Layout.BOARD_SIZE - 1 and gy < Layout.BOARD_SIZE - 1: hover = (gx, gy, target['orient'], self.game.is_legal_wall(gx, gy, target['orient']))
+
+        board_rect = self.board_rect()
+        regions = {
+            'header': (pygame.Rect(0, 0, Layout.SCREEN_WIDTH, board_rect.top),
+                       (self.status_text(), game.p1_walls, game.p2_walls)),
+            'board': (board_rect, (self._board_key, game.p1_pos, game.p2_pos, tuple(valid_moves), hover)),
+        }
+        for i, btn in enumerate(self.game_buttons):
+            regions[i] = (btn.rect, btn.hovered)
+        if self.show_stats:
+            lines = tuple(self.stats_lines())
+            regions['stats'] = (self.stats_rect(len(lines)), lines)
+        if game.winner:
+            # The overlay dims everything, so any change repaints the whole window
+            sig = (tuple(sig for _, sig in regions.values()), self.rematch_btn.hovered, self.menu_overlay_btn.hovered)
+            regions = {'winner': (self.screen.get_rect(), sig)}
+
+        full = self._full_redraw or regions.keys() != self._region_sigs.keys()
+        dirty = []
+        for name, (rect, sig) in regions.items():
+            if full or self._region_sigs.get(name) != sig: dirty.append(rect)
+        self._region_sigs = {name: sig for name, (_, sig) in regions.items()}
+        self._full_redraw = False
+        if full: dirty = [self.screen.get_rect()]
+        if not dirty: return []
+
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self.screen.blit(self.board_layer, rect, rect)
+            self.draw_game_content(valid_moves, hover)
+        self.screen.set_clip(None)
+        return dirty
+
+    def draw_game_content(self, valid_moves, hover):
+        """Everything drawn over the board layer; callers clip to the region being repainted."""
+        game = self.game
+        txt = self.render_text(self.font_lg, self.status_text(), Theme.BUTTON_TEXT)
         self.screen.blit(txt, (Layout.SCREEN_WIDTH//2 - txt.get_width()//2, 20))
 
         # Stats
-        p1_lbl = self.font_sm.render("P1 Walls: ", True, Theme.BUTTON_TEXT)
-        p1_val = self.font_sm.render(str(self.game.p1_walls), True, Theme.PLAYER_1)
-        p2_lbl = self.font_sm.render("P2 Walls: ", True, Theme.BUTTON_TEXT)
-        p2_val = self.font_sm.render(str(self.game.p2_walls), True, Theme.PLAYER_2)
+        p1_lbl = self.render_text(self.font_sm, "P1 Walls: ", Theme.BUTTON_TEXT)
+        p1_val = self.render_text(self.font_sm, str(game.p1_walls), Theme.PLAYER_1)
+        p2_lbl = self.render_text(self.font_sm, "P2 Walls: ", Theme.BUTTON_TEXT)
+        p2_val = self.render_text(self.font_sm, str(game.p2_walls), Theme.PLAYER_2)
         
         y_stats = 30
         self.screen.blit(p1_lbl, (50, y_stats))
@@ -335,53 +485,72 @@ class QuoridorGUI:
         self.screen.blit(p2_lbl, (start_p2, y_stats))
         self.screen.blit(p2_val, (start_p2 + p2_lbl.get_width(), y_stats))
 
-        # Board BG
-        board_rect = (Layout.MARGIN_X - 10, Layout.MARGIN_Y - 10, 
-                      (9*Layout.CELL_SIZE + 8*Layout.GAP_SIZE) + 20, 
-                      (9*Layout.CELL_SIZE + 8*Layout.GAP_SIZE) + 20)
-        pygame.draw.rect(self.screen, Theme.BOARD_BG, board_rect, border_radius=8)
-
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        target = self.get_interaction_target(mouse_x, mouse_y)
-        valid_moves = self.game.get_valid_pawn_moves(self.game.turn) if not self.game.winner and (self.game_mode == "PVP" or self.game.turn == 1) else []
-
-        for y in range(9):
-            for x in range(9):
-                px, py = self.to_screen_coords(x, y)
-                pygame.draw.rect(self.screen, Theme.CELL_BG, (px, py, Layout.CELL_SIZE, Layout.CELL_SIZE), border_radius=4)
-                
-                if (x, y) in valid_moves:
-                    cx, cy = px + Layout.CELL_SIZE//2, py + Layout.CELL_SIZE//2
-                    if target['type'] == 'MOVE' and target['grid'] == (x, y):
-                         draw_aa_circle(self.screen, cx, cy, int(Layout.CELL_SIZE * 0.2), Theme.CELL_HOVER)
-                    else:
-                         draw_aa_circle(self.screen, cx, cy, int(Layout.CELL_SIZE * 0.12), Theme.VALID_MOVE_DOT)
-
-        for wall in self.game.walls:
-            self.draw_wall_rect(wall[0][0], wall[0][1], wall[1], Theme.WALL_PLACED)
+        for x, y in valid_moves:
+            px, py = self.to_screen_coords(x, y)
+            cx, cy = px + Layout.CELL_SIZE//2, py + Layout.CELL_SIZE//2
+            if hover == (x, y):
+                draw_aa_circle(self.screen, cx, cy, int(Layout.CELL_SIZE * 0.2), Theme.CELL_HOVER)
+            else:
+                draw_aa_circle(self.screen, cx, cy, int(Layout.CELL_SIZE * 0.12), Theme.VALID_MOVE_DOT)
 
-        self.draw_player(self.game.p1_pos, 1)
-        self.draw_player(self.game.p2_pos, 2)
+        self.draw_player(game.p1_pos, 1)
+        self.draw_player(game.p2_pos, 2)
         
-        human_turn = (self.game_mode == "PVP") or (self.game_mode == "PVE" and self.game.turn == 1)
-        if not self.game.winner and human_turn and target['type'] == 'WALL':
-            self.draw_wall_preview(target['grid'], target['orient'])
+        if hover and len(hover) == 4:
+            self.draw_wall_preview(hover[:2], hover[2], hover[3])
 
         # Buttons
         for btn in self.game_buttons:
             btn.draw(self.screen, self.font_sm)
 
+        if self.show_stats: self.draw_stats()
+
         # Winner Overlay
-        if self.game.winner:
+        if game.winner:
             self.draw_winner()
             if self.rematch_btn:
                 self.rematch_btn.draw(self.screen, self.font_md)
             if self.menu_overlay_btn:
                 self.menu_overlay_btn.draw(self.screen, self.font_md)
         else:
-            hint_txt = self.font_hint.render("Right-Click to Rotate Wall", True, Theme.VALID_MOVE_DOT)
+            hint_txt = self.render_text(self.font_hint, "Right-Click to Rotate Wall", Theme.VALID_MOVE_DOT)
             self.screen.blit(hint_txt, (Layout.SCREEN_WIDTH//2 - hint_txt.get_width()//2, Layout.SCREEN_HEIGHT - 35))
 
+    def stats_lines(self):
+        lines = []
+        game_counts = self.game.stats.as_dict()
+        st = self.ai.stats.last if self.ai else None # snapshot; the live stats belong to the search thread
+        if st:
+            game_counts = st['game']
+            move = '-' if st['move'] is None else move_to_notation(self.game.geo, st['move'])
+            lines.append(f"AI {st['source']}: move {move} in {st['seconds']:.2f}s")
+            lines.append(f"depth {st['depth']}  nodes {st['nodes']}  {st['nodes_per_second'] or 0:.0f} n/s")
+            lines.append(f"TT {st['tt_hit_rate']:.0%} of {st['tt_probes']}  branching {st['branching_factor']}")
+            lines.append("cutoffs " + "/".join(map(str, st['cutoffs_per_ply'][:6])))
+            phases = "  ".join(f"{k} {v:.2f}s" for k, v in st['phases'].items() if v >= 0.005)
+            if phases: lines.append(phases)
+        lines.append(f"paths {game_counts['shortest_path_calls']} (A* {game_counts['path_searches']})"
+                     f"  lens {game_counts['shortest_path_len_calls']}")
+        lines.append(f"wall checks {game_counts['wall_checks']} (off-path {game_counts['wall_path_miss']})")
+        lookups = game_counts['field_cache_hits'] + game_counts['field_cache_misses']
+        if lookups: lines.append(f"path cache {game_counts['field_cache_hits'] / lookups:.0%} of {lookups}")
+        return lines
+
+    def stats_rect(self, num_lines):
+        return pygame.Rect(10, 70, 330, 10 + num_lines * (self.font_hint.get_linesize() + 2))
+
+    def draw_stats(self):
+        lines = self.stats_lines()
+        rect = self.stats_rect(len(lines))
+        if self.stats_panel is None or self.stats_panel.get_size() != rect.size:
+            self.stats_panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+            self.stats_panel.fill((0, 0, 0, 170))
+        self.screen.blit(self.stats_panel, rect.topleft)
+        y = rect.top + 5
+        for line in lines:
+            self.screen.blit(self.render_text(self.font_hint, line, Theme.BUTTON_TEXT), (rect.left + 8, y))
+            y += self.font_hint.get_linesize() + 2
+
     def draw_player(self, pos, pid):
         px, py = self.to_screen_coords(pos[0], pos[1])
         cx, cy = px + Layout.CELL_SIZE // 2, py + Layout.CELL_SIZE // 2
@@ -395,51 +564,58 @@ class QuoridorGUI:
             draw_aa_circle(self.screen, cx, cy, r, col)
             pygame.gfxdraw.aacircle(self.screen, cx, cy, r, (0,0,0))
 
-    def draw_wall_rect(self, x, y, orientation, color):
-        px, py = self.to_screen_coords(x, y)
-        if orientation == 'H':
-            pygame.draw.rect(self.screen, color, (px, py + Layout.CELL_SIZE, (Layout.CELL_SIZE * 2) + Layout.GAP_SIZE, Layout.GAP_SIZE), border_radius=2)
-        else:
-            pygame.draw.rect(self.screen, color, (px + Layout.CELL_SIZE, py, Layout.GAP_SIZE, (Layout.CELL_SIZE * 2) + Layout.GAP_SIZE), border_radius=2)
-
-    def draw_wall_preview(self, grid_pos, orientation):
-        gx, gy = grid_pos
-        if gx >= 8 or gy >= 8: return 
-        is_valid = self.game.is_valid_wall(gx, gy, orientation)
+    def draw_wall_preview(self, grid_pos, orientation, is_valid):
+        rect = self.wall_rect(grid_pos[0], grid_pos[1], orientation)
         color = Theme.WALL_PREVIEW_VALID if is_valid else Theme.WALL_PREVIEW_INVALID
-        s = pygame.Surface((Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT), pygame.SRCALPHA)
-        px, py = self.to_screen_coords(gx, gy)
-        
-        rect = (0,0,0,0)
-        if orientation == 'H':
-            rect = (px, py + Layout.CELL_SIZE, (Layout.CELL_SIZE * 2) + Layout.GAP_SIZE, Layout.GAP_SIZE)
-        else:
-            rect = (px + Layout.CELL_SIZE, py, Layout.GAP_SIZE, (Layout.CELL_SIZE * 2) + Layout.GAP_SIZE)
-            
-        pygame.draw.rect(s, color, rect, border_radius=2)
-        self.screen.blit(s, (0,0))
+        key = (rect.size, color)
+        s = self._preview_surfs.get(key)
+        if s is None:
+            s = self._preview_surfs[key] = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(s, color, s.get_rect(), border_radius=2)
+        self.screen.blit(s, rect.topleft)
 
     def draw_winner(self):
-        s = pygame.Surface((Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 180))
-        self.screen.blit(s, (0,0))
-        txt = self.font_lg.render(f"PLAYER {self.game.winner} WINS!", True, Theme.BUTTON_TEXT)
+        if self.dim_overlay is None:
+            self.dim_overlay = pygame.Surface((Layout.SCREEN_WIDTH, Layout.SCREEN_HEIGHT), pygame.SRCALPHA)
+            self.dim_overlay.fill((0, 0, 0, 180))
+        self.screen.blit(self.dim_overlay, (0,0))
+        txt = self.render_text(self.font_lg, f"PLAYER {self.game.winner} WINS!", Theme.BUTTON_TEXT)
         self.screen.blit(txt, (Layout.SCREEN_WIDTH//2 - txt.get_width()//2, Layout.SCREEN_HEIGHT//2 - 50))
 
-    def run(self):
+    def show_first_frame(self):
+        """Draw the menu, then start loading assets behind it."""
         self.recalculate_ui()
+        pygame.display.update(self.draw_menu())
+        self.assets.start()
+
+    def run(self):
+        """Sleep in pygame.event.wait until input arrives, polling only while the AI thinks."""
+        self.show_first_frame()
         while self.running:
+            thinking = self.ai_worker is not None
+            event = pygame.event.wait(GameConfig.GUI_AI_POLL_MS if thinking else GameConfig.GUI_IDLE_WAIT_MS)
             events = pygame.event.get()
+            if event.type != pygame.NOEVENT: events.insert(0, event)
+            elif not thinking and not self._full_redraw and not self.ai_turn(): continue
+
             for event in events:
                 if event.type == pygame.QUIT:
-                    self.running = False
-                    sys.exit()
+                    self.exit_game()
+
+                if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    self.invalidate()
+
+                if event.type == ASSETS_LOADED_EVENT:
+                    if self.assets.image('logo'): pygame.display.set_icon(self.assets.image('logo'))
+                    self.recalculate_ui()
+                    self.invalidate()
                 
                 if event.type == pygame.VIDEORESIZE:
                     Layout.update(event.w, event.h)
                     self.recalculate_ui()
-                    self.draw_menu() if self.state == "MENU" else self.draw_game()
-                    pygame.display.flip()
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.show_stats = not self.show_stats
                     
                 if self.state == "MENU":
                     for btn in self.menu_buttons: btn.handle_event(event)
@@ -460,26 +636,17 @@ class QuoridorGUI:
                                 btn_clicked = any(b.rect.collidepoint(event.pos) for b in self.game_buttons)
                                 if not btn_clicked:
                                     if target['type'] == 'MOVE':
-                                        if target['grid'] in self.game.get_valid_pawn_moves(self.game.turn):
-                                            self.game.apply_move({'type': 'MOVE', 'dest': target['grid']})
+                                        if target['grid'] in self.valid_pawn_moves():
+                                            self.play_move({'type': 'MOVE', 'dest': target['grid']})
                                             self.play_sound()
                                     elif target['type'] == 'WALL':
-                                        if self.game.is_valid_wall(target['grid'][0], target['grid'][1], target['orient']):
-                                            self.game.apply_move({'type': 'WALL', 'pos': target['grid'], 'orient': target['orient']})
+                                        if self.game.is_legal_wall(target['grid'][0], target['grid'][1], target['orient']):
+                                            self.play_move({'type': 'WALL', 'pos': target['grid'], 'orient': target['orient']})
                                             self.play_sound()
 
-            if self.state == "GAME":
-                if not self.game.winner and self.game_mode == "PVE" and self.game.turn == 2:
-                    self.draw_game()
-                    pygame.display.flip()
-                    move = self.ai.get_move(self.game)
-                    if move:
-                        self.game.apply_move(move, record_history=False)
-                        self.play_sound()
-                    else:
-                        print("AI Resigns")
-                self.draw_game()
-            else:
-                self.draw_menu()
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.ai_turn():
+                self.update_ai()
+            dirty = self.draw_game() if self.state == "GAME" else self.draw_menu()
+            if dirty:
+                pygame.display.update(dirty)
+                self.clock.tick(60)